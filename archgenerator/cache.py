@@ -0,0 +1,167 @@
+from asyncio import CancelledError, Future, get_running_loop, shield
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from json import dumps
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Generic, Hashable, Iterable, TypeVar, cast
+
+from .docs.cache import DiskCache, content_hash
+from .events import EventType, emit
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+CACHE_STORE: ContextVar[DiskCache | None] = ContextVar("CACHE_STORE", default=None)
+
+_MISSING: Any = object()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    load_seconds: float = 0.0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.coalesced + self.misses
+        return (self.hits + self.coalesced) / total if total else 0.0
+
+    @property
+    def mean_load_seconds(self) -> float:
+        return self.load_seconds / self.misses if self.misses else 0.0
+
+
+class Cache(Generic[K, V]):
+    def __init__(self, name: str, maxsize: int | None = None, persist: bool = False) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.persist = persist
+        self.stats = CacheStats()
+
+        self._memory: OrderedDict[K, V] = OrderedDict()
+        self._preloaded: dict[K, V] = {}
+        self._inflight: dict[K, Future[V]] = {}
+
+    def __len__(self) -> int:
+        return len(self._memory) + len(self._preloaded)
+
+    def _store(self) -> DiskCache | None:
+        return CACHE_STORE.get() if self.persist else None
+
+    def _store_key(self, key: K) -> str:
+        return f"{self.name}:{content_hash(dumps(key))}"
+
+    def clear(self) -> None:
+        self.stats = CacheStats()
+        self._memory.clear()
+        self._preloaded.clear()
+
+    def load(self, items: Iterable[tuple[K, V]]) -> None:
+        self._preloaded.update(items)
+
+    def get(self, key: K, default: Any = None) -> Any:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+
+        if (value := self._preloaded.pop(key, _MISSING)) is _MISSING:
+            store = self._store()
+            if store is None or (store_key := self._store_key(key)) not in store:
+                return default
+
+            value = store[store_key]
+
+        self._remember(key, value)
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self._remember(key, value)
+
+        if (store := self._store()) is not None:
+            store[self._store_key(key)] = value
+
+    def _remember(self, key: K, value: V) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+
+        if self.maxsize is not None and len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def get_or_load(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        while True:
+            if (value := self.get(key, _MISSING)) is not _MISSING:
+                self.stats.hits += 1
+                emit(EventType.CACHE_HIT, function=self.name)
+                return cast(V, value)
+
+            if (pending := self._inflight.get(key)) is None:
+                return await self._load(key, loader)
+
+            self.stats.coalesced += 1
+            emit(EventType.CACHE_HIT, function=self.name, coalesced=True)
+
+            if (value := await shield(pending)) is not _MISSING:
+                return cast(V, value)
+
+    async def _load(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        future: Future[V] = get_running_loop().create_future()
+        self._inflight[key] = future
+        start = perf_counter()
+
+        try:
+            value = await loader()
+        except CancelledError:
+            future.set_result(_MISSING)
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            self[key] = value
+        finally:
+            del self._inflight[key]
+
+            elapsed = perf_counter() - start
+            self.stats.misses += 1
+            self.stats.load_seconds += elapsed
+            emit(EventType.CACHE_MISS, function=self.name, seconds=elapsed)
+
+        return value
+
+
+CACHES: dict[str, Cache[Any, Any]] = {}
+
+
+def get_cache(name: str, maxsize: int | None = None, persist: bool = False) -> Cache[Any, Any]:
+    if name not in CACHES:
+        CACHES[name] = Cache(name, maxsize, persist)
+
+    return CACHES[name]
+
+
+def cache_stats() -> dict[str, CacheStats]:
+    return {name: cache.stats for name, cache in CACHES.items()}
+
+
+def report_cache_stats() -> None:
+    for name, stats in cache_stats().items():
+        if stats.hits or stats.misses or stats.coalesced:
+            emit(EventType.CACHE_STATS, function=name, hit_ratio=stats.hit_ratio, **asdict(stats))
+
+
+__all__ = [
+    "CACHES",
+    "CACHE_STORE",
+    "Cache",
+    "CacheStats",
+    "cache_stats",
+    "get_cache",
+    "report_cache_stats",
+]
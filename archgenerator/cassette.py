@@ -0,0 +1,113 @@
+from asyncio import sleep
+from base64 import b64decode, b64encode
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from hashlib import sha1
+from json import dumps, loads
+from pathlib import Path
+from random import uniform
+
+from httpx import AsyncBaseTransport, Request, Response
+
+SKIPPED_RESPONSE_HEADERS = {"set-cookie", "transfer-encoding", "connection", "keep-alive"}
+
+
+@dataclass
+class Interaction:
+    key: str
+    method: str
+    url: str
+    status: int
+    headers: list[tuple[str, str]]
+    body: str
+
+    @property
+    def content(self) -> bytes:
+        return b64decode(self.body)
+
+
+def request_key(request: Request) -> str:
+    key = f"{request.method} {request.url}"
+
+    if request.headers.get("Content-Type", "").startswith("application/json"):
+        key += f" {sha1(request.content).hexdigest()}"
+
+    return key
+
+
+@dataclass
+class Cassette:
+    path: Path
+    interactions: list[Interaction] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: Path) -> "Cassette":
+        return cls(path, [Interaction(**item) for item in loads(path.read_text(encoding="utf-8"))["interactions"]])
+
+    def save(self) -> None:
+        self.path.write_text(
+            dumps({"interactions": [asdict(interaction) for interaction in self.interactions]}),
+            encoding="utf-8",
+        )
+
+
+class RecordingTransport(AsyncBaseTransport):
+    def __init__(self, transport: AsyncBaseTransport, cassette: Cassette) -> None:
+        self.transport = transport
+        self.cassette = cassette
+
+    async def handle_async_request(self, request: Request) -> Response:
+        await request.aread()
+        response = await self.transport.handle_async_request(request)
+
+        try:
+            content = b"".join([chunk async for chunk in response.aiter_raw()])
+        finally:
+            await response.aclose()
+
+        self.cassette.interactions.append(
+            Interaction(
+                key=request_key(request),
+                method=request.method,
+                url=str(request.url),
+                status=response.status_code,
+                headers=[(k, v) for k, v in response.headers.items() if k.lower() not in SKIPPED_RESPONSE_HEADERS],
+                body=b64encode(content).decode("ascii"),
+            )
+        )
+
+        return Response(response.status_code, headers=response.headers, content=content, extensions=response.extensions)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class ReplayTransport(AsyncBaseTransport):
+    def __init__(self, cassette: Cassette, latency: float = 0.0, jitter: float = 0.0) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.interactions: dict[str, deque[Interaction]] = defaultdict(deque)
+
+        for interaction in cassette.interactions:
+            self.interactions[interaction.key].append(interaction)
+
+    async def handle_async_request(self, request: Request) -> Response:
+        await request.aread()
+
+        if not (recorded := self.interactions.get(request_key(request))):
+            raise LookupError(f"No recorded response for {request.method} {request.url}")
+
+        interaction = recorded.popleft() if len(recorded) > 1 else recorded[0]
+
+        if delay := self.latency + uniform(0, self.jitter):
+            await sleep(delay)
+
+        return Response(interaction.status, headers=interaction.headers, content=interaction.content)
+
+
+__all__ = [
+    "Cassette",
+    "Interaction",
+    "RecordingTransport",
+    "ReplayTransport",
+]
@@ -1,26 +1,126 @@
 from asyncio import run
-from functools import wraps
+from cProfile import Profile
+from functools import partial, wraps
+from io import StringIO
 from pathlib import Path
+from pstats import SortKey, Stats
 from typing import Callable, Any
 
 import click
+from httpx import AsyncHTTPTransport
 
+from ..cache import CACHE_STORE, report_cache_stats
+from ..cassette import Cassette, RecordingTransport, ReplayTransport
+from ..client import TRANSPORT_FACTORY
+from ..concurrency import CONCURRENCY_OVERRIDES
 from ..configurator import load_config
 from ..docs import context
-from ..docs.commit import commit_docs
-from ..docs.generator import generate_docs
+from ..docs.cache import DiskCache
+from ..docs.commit import BATCH_MODES, STAGING_MODES, commit_docs
+from ..docs.generator import SUMMARY_MODES, generate_docs
+from ..events import subscribe
 from ..models import Book
 from ..platform import PLATFORMS, load_platforms, Platform
 from ..serializer import load, dump
+from ..subscribers import JsonLinesSubscriber, ProgressSubscriber, PrometheusSubscriber
+from ..sync import generate_books, load_books, publish
+from ..tracing import TRACER, Tracer, span
+from ..watch import Watcher
 from ..workflow import init_workflow
 
 DEFAULT_PATH = click.Path(dir_okay=False, writable=True, resolve_path=True)
 DEFAULT_DIR_PATH = click.Path(file_okay=False, resolve_path=True)
 
 
+def _parse_concurrency(ctx: click.Context, param: click.Parameter, values: tuple[str, ...]) -> dict[str | None, int]:
+    overrides: dict[str | None, int] = {}
+
+    for value in values:
+        host, _, limit = value.rpartition("=")
+
+        if not limit.isdigit() or int(limit) < 1:
+            raise click.BadParameter(f"expected N or HOST=N with N >= 1, got {value!r}")
+
+        overrides[host or None] = int(limit)
+
+    return overrides
+
+
 @click.group()
-def main_cli() -> None:
-    pass
+@click.option("--progress", is_flag=True, default=False)
+@click.option("--events", "events_path", type=DEFAULT_PATH, default=None)
+@click.option("--metrics", "metrics_path", type=DEFAULT_PATH, default=None)
+@click.option("--cache-file", "cache_path", type=DEFAULT_PATH, default=None)
+@click.option("--trace", "trace_path", type=DEFAULT_PATH, default=None)
+@click.option("--profile", is_flag=True, default=False)
+@click.option("--record", "record_path", type=DEFAULT_PATH, default=None)
+@click.option("--replay", "replay_path", type=click.Path(exists=True, dir_okay=False), default=None)
+@click.option("--replay-latency", type=float, default=0.0)
+@click.option("--concurrency", type=str, multiple=True, callback=_parse_concurrency, metavar="[HOST=]N")
+@click.pass_context
+def main_cli(
+    ctx: click.Context,
+    progress: bool,
+    events_path: str | None,
+    metrics_path: str | None,
+    cache_path: str | None,
+    trace_path: str | None,
+    profile: bool,
+    record_path: str | None,
+    replay_path: str | None,
+    replay_latency: float,
+    concurrency: dict[str | None, int],
+) -> None:
+    if record_path and replay_path:
+        raise click.UsageError("--record and --replay are mutually exclusive")
+
+    if record_path:
+        cassette = Cassette(Path(record_path))
+        TRANSPORT_FACTORY.set(lambda: RecordingTransport(AsyncHTTPTransport(), cassette))
+        ctx.call_on_close(cassette.save)
+    elif replay_path:
+        replayed = Cassette.load(Path(replay_path))
+        TRANSPORT_FACTORY.set(lambda: ReplayTransport(replayed, replay_latency))
+
+    if concurrency:
+        CONCURRENCY_OVERRIDES.set(concurrency)
+
+    if profile:
+        profiler = Profile()
+        ctx.call_on_close(partial(_profile_report, profiler))
+        profiler.enable()
+
+    if cache_path:
+        store = DiskCache(Path(cache_path))
+        CACHE_STORE.set(store)
+        ctx.call_on_close(store.save)
+
+    subscribers: list[Any] = []
+
+    if progress:
+        subscribers.append(ProgressSubscriber())
+    if events_path:
+        subscribers.append(JsonLinesSubscriber(Path(events_path)))
+    if metrics_path:
+        subscribers.append(PrometheusSubscriber(Path(metrics_path)))
+    if trace_path:
+        tracer = Tracer(Path(trace_path))
+        TRACER.set(tracer)
+        subscribers.append(tracer)
+
+    for subscriber in subscribers:
+        ctx.call_on_close(subscribe(subscriber))
+        ctx.call_on_close(subscriber.close)
+
+    ctx.call_on_close(report_cache_stats)
+
+
+def _profile_report(profiler: Profile, limit: int = 50) -> None:
+    profiler.disable()
+
+    report = StringIO()
+    Stats(profiler, stream=report).sort_stats(SortKey.CUMULATIVE).print_stats(limit)
+    click.echo(report.getvalue(), err=True)
 
 
 def _init_config(func: Callable[..., Any]) -> Callable[..., Any]:
@@ -47,7 +147,16 @@ def _add_entry_point(platform: Platform) -> None:
         old_book = load(Book, book_path) if book_path.exists() else None
 
         new_book = run(platform.generate_book(old_book))
-        dump(new_book, book_path)
+
+        with span("dump", book=new_book.name):
+            dump(new_book, book_path)
+
+
+def _platforms_cli(func: Callable[..., Any]) -> Callable[..., Any]:
+    for platform in PLATFORMS.values():
+        func = platform.wrap_cli(func, prefix=platform.name)
+
+    return func
 
 
 load_platforms()
@@ -58,13 +167,15 @@ for p in PLATFORMS.values():
 
 @main_cli.command(name="docs")
 @click.option("-p", "--path", type=DEFAULT_DIR_PATH, default=".")
+@click.option("-w", "--workers", type=int, default=None)
+@click.option("--summary", type=click.Choice(SUMMARY_MODES), default=None)
 @_init_config
-def docs_cli(path: str, **_: Any) -> None:
+def docs_cli(path: str, workers: int | None = None, summary: str | None = None, **_: Any) -> None:
     root = Path(path).resolve()
-    books = [load(Book, p) for p in root.glob("*.json") if p.name not in {"book.json", "config.json"}]
+    books = load_books(root)
     books.sort(key=lambda book: book.name)
 
-    generate_docs(books, root)
+    generate_docs(books, root, workers, summary)
 
 
 @main_cli.command(name="commit")
@@ -72,18 +183,74 @@ def docs_cli(path: str, **_: Any) -> None:
 @click.option("--push", type=bool, is_flag=True, default=False)
 @click.option("--git-email", envvar="GIT_EMAIL", type=str)
 @click.option("--git-username", envvar="GIT_USERNAME", type=str)
+@click.option("--batch", type=click.Choice(BATCH_MODES), default=None)
+@click.option("--batch-size", type=click.IntRange(min=1), default=None)
+@click.option("--staging", type=click.Choice(STAGING_MODES), default=None)
 @_init_config
 def docs_commit_cli(
     path: str,
     push: bool = False,
     git_username: str | None = None,
     git_email: str | None = None,
+    batch: str | None = None,
+    batch_size: int | None = None,
+    staging: str | None = None,
+    **_: Any,
+) -> None:
+    context.GIT_EMAIL.set(git_email)
+    context.GIT_USERNAME.set(git_username)
+
+    commit_docs(Path(path).resolve(), push, batch, batch_size, staging)
+
+
+@main_cli.command(name="sync")
+@click.option("-p", "--path", type=DEFAULT_DIR_PATH, default=".")
+@click.option("--push", type=bool, is_flag=True, default=False)
+@click.option("--git-email", envvar="GIT_EMAIL", type=str)
+@click.option("--git-username", envvar="GIT_USERNAME", type=str)
+@click.option("-w", "--workers", type=int, default=None)
+@_init_config
+@_platforms_cli
+def sync_cli(
+    path: str,
+    push: bool = False,
+    git_username: str | None = None,
+    git_email: str | None = None,
+    workers: int | None = None,
+    **_: Any,
+) -> None:
+    context.GIT_EMAIL.set(git_email)
+    context.GIT_USERNAME.set(git_username)
+
+    root = Path(path).resolve()
+    publish(root, run(generate_books(root)), push, workers)
+
+
+@main_cli.command(name="watch")
+@click.option("-p", "--path", type=DEFAULT_DIR_PATH, default=".")
+@click.option("--push", type=bool, is_flag=True, default=False)
+@click.option("--git-email", envvar="GIT_EMAIL", type=str)
+@click.option("--git-username", envvar="GIT_USERNAME", type=str)
+@click.option("-w", "--workers", type=int, default=None)
+@click.option("-i", "--interval", type=float, default=300, show_default=True)
+@click.option("-n", "--iterations", type=int, default=None)
+@_init_config
+@_platforms_cli
+def watch_cli(
+    path: str,
+    push: bool = False,
+    git_username: str | None = None,
+    git_email: str | None = None,
+    workers: int | None = None,
+    interval: float = 300,
+    iterations: int | None = None,
     **_: Any,
 ) -> None:
     context.GIT_EMAIL.set(git_email)
     context.GIT_USERNAME.set(git_username)
 
-    commit_docs(Path(path).resolve(), push)
+    watcher = Watcher(Path(path).resolve(), push_commit=push, workers=workers)
+    run(watcher.run(interval, iterations))
 
 
 @main_cli.command(name="init-workflow")
@@ -0,0 +1,118 @@
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, AsyncIterator, Callable, cast
+
+from httpx import AsyncBaseTransport, AsyncByteStream, AsyncClient, AsyncHTTPTransport, Request, Response
+
+from .concurrency import LimitedTransport
+from .events import EventType, emit
+
+
+class MeasuredStream(AsyncByteStream):
+    def __init__(self, stream: AsyncByteStream, on_close: Callable[[int], None]) -> None:
+        self.stream = stream
+        self.on_close = on_close
+        self.size = 0
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            self.size += len(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self.stream.aclose()
+        self.on_close(self.size)
+
+
+class InstrumentedTransport(AsyncBaseTransport):
+    def __init__(self, transport: AsyncBaseTransport) -> None:
+        self.transport = transport
+
+    async def handle_async_request(self, request: Request) -> Response:
+        method, url = request.method, str(request.url)
+
+        emit(EventType.REQUEST_START, method=method, url=url)
+        start = perf_counter()
+
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException as exc:
+            emit(
+                EventType.REQUEST_END,
+                method=method,
+                url=url,
+                status=None,
+                seconds=perf_counter() - start,
+                bytes=0,
+                error=repr(exc),
+            )
+            raise
+
+        def on_close(size: int) -> None:
+            emit(
+                EventType.REQUEST_END,
+                method=method,
+                url=url,
+                status=response.status_code,
+                seconds=perf_counter() - start,
+                bytes=size,
+            )
+
+        assert isinstance(response.stream, AsyncByteStream)
+
+        return Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=MeasuredStream(response.stream, on_close),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+async def poll_fingerprint(
+    client: AsyncClient,
+    url: str,
+    state: dict[str, Any],
+    digest: Callable[[bytes], str],
+    **kwargs: Any,
+) -> str:
+    headers = {}
+    if etag := state.get("etag"):
+        headers["If-None-Match"] = etag
+    if last_modified := state.get("last_modified"):
+        headers["If-Modified-Since"] = last_modified
+
+    response = await client.get(url, headers=headers, **kwargs)
+    content = await response.aread()
+
+    if response.status_code == 304 and "fingerprint" in state:
+        return cast(str, state["fingerprint"])
+
+    response.raise_for_status()
+    state.update(
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        fingerprint=digest(content),
+    )
+
+    return cast(str, state["fingerprint"])
+
+
+TRANSPORT_FACTORY: ContextVar[Callable[[], AsyncBaseTransport]] = ContextVar(
+    "TRANSPORT_FACTORY",
+    default=AsyncHTTPTransport,
+)
+
+
+def create_client(**kwargs: Any) -> AsyncClient:
+    return AsyncClient(transport=LimitedTransport(InstrumentedTransport(TRANSPORT_FACTORY.get()())), **kwargs)
+
+
+__all__ = [
+    "TRANSPORT_FACTORY",
+    "InstrumentedTransport",
+    "create_client",
+    "poll_fingerprint",
+]
@@ -0,0 +1,229 @@
+from asyncio import Future, get_running_loop, sleep
+from collections import deque
+from contextvars import ContextVar
+from math import inf
+from time import monotonic, perf_counter
+from typing import AsyncIterator, Callable, TypedDict
+
+from httpx import AsyncBaseTransport, AsyncByteStream, NetworkError, Request, Response, TimeoutException
+
+from .configurator import add_config
+
+
+class ConcurrencyConfig(TypedDict):
+    adaptive: bool
+    initial: int
+    minimum: int
+    maximum: int
+    increase: float
+    decrease: float
+    latency_tolerance: float
+    static: int | None
+    hosts: dict[str, int]
+
+
+CONCURRENCY_CONFIG: ConcurrencyConfig = {
+    "adaptive": True,
+    "initial": 8,
+    "minimum": 1,
+    "maximum": 64,
+    "increase": 1.0,
+    "decrease": 0.5,
+    "latency_tolerance": 3.0,
+    "static": None,
+    "hosts": {},
+}
+
+add_config("concurrency", CONCURRENCY_CONFIG)
+
+CONCURRENCY_OVERRIDES: ContextVar[dict[str | None, int]] = ContextVar("CONCURRENCY_OVERRIDES", default={})
+
+OVERLOAD_STATUSES = {429, 502, 503, 504}
+
+
+class AdaptiveLimiter:
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: int = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_tolerance: float = 3.0,
+        adaptive: bool = True,
+    ) -> None:
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.adaptive = adaptive
+
+        self.inflight = 0
+        self.min_latency = inf
+        self.blocked_until = 0.0
+
+        self._last_decrease = 0.0
+        self._waiters: deque[Future[None]] = deque()
+
+    @property
+    def available(self) -> int:
+        return max(1, int(self.limit)) - self.inflight
+
+    async def acquire(self) -> None:
+        while True:
+            if (delay := self.blocked_until - monotonic()) > 0:
+                await sleep(delay)
+                continue
+
+            if self.available > 0:
+                self.inflight += 1
+                return
+
+            waiter: Future[None] = get_running_loop().create_future()
+            self._waiters.append(waiter)
+
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    def release(self, latency: float | None = None, overloaded: bool = False, retry_after: float | None = None) -> None:
+        self.inflight -= 1
+
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, monotonic() + retry_after)
+
+        if self.adaptive and latency is not None:
+            self._adjust(latency, overloaded)
+
+        for _ in range(self.available):
+            if not self._waiters:
+                break
+
+            if not (waiter := self._waiters.popleft()).done():
+                waiter.set_result(None)
+
+    def _adjust(self, latency: float, overloaded: bool) -> None:
+        now = monotonic()
+
+        if overloaded:
+            if now - latency > self._last_decrease:
+                self.limit = max(self.minimum, self.limit * self.decrease)
+                self._last_decrease = now
+
+            return
+
+        self.min_latency = min(self.min_latency, latency)
+        if latency <= self.min_latency * self.latency_tolerance:
+            self.limit = min(self.maximum, self.limit + self.increase / self.limit)
+
+
+LIMITERS: dict[str, AdaptiveLimiter] = {}
+
+
+def _static_limits() -> tuple[int | None, dict[str, int]]:
+    config, overrides = CONCURRENCY_CONFIG, CONCURRENCY_OVERRIDES.get()
+    hosts = {**config["hosts"], **{host: limit for host, limit in overrides.items() if host is not None}}
+
+    return overrides.get(None, config["static"]), hosts
+
+
+def max_concurrency() -> int:
+    static, hosts = _static_limits()
+    return max(CONCURRENCY_CONFIG["maximum"], static or 0, *hosts.values())
+
+
+def host_limiter(host: str) -> AdaptiveLimiter:
+    if host not in LIMITERS:
+        config = CONCURRENCY_CONFIG
+        default, hosts = _static_limits()
+
+        if (static := hosts.get(host, default)) is not None:
+            LIMITERS[host] = AdaptiveLimiter(static, adaptive=False)
+        else:
+            LIMITERS[host] = AdaptiveLimiter(
+                config["initial"],
+                config["minimum"],
+                config["maximum"],
+                config["increase"],
+                config["decrease"],
+                config["latency_tolerance"],
+                config["adaptive"],
+            )
+
+    return LIMITERS[host]
+
+
+def _retry_after(response: Response) -> float | None:
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+class ReleasingStream(AsyncByteStream):
+    def __init__(self, stream: AsyncByteStream, release: Callable[[], None]) -> None:
+        self.stream = stream
+        self.release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self.stream.aclose()
+        finally:
+            self.release()
+
+
+class LimitedTransport(AsyncBaseTransport):
+    def __init__(self, transport: AsyncBaseTransport) -> None:
+        self.transport = transport
+
+    async def handle_async_request(self, request: Request) -> Response:
+        limiter = host_limiter(request.url.host)
+        await limiter.acquire()
+
+        start = perf_counter()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except (TimeoutException, NetworkError):
+            limiter.release(perf_counter() - start, overloaded=True)
+            raise
+        except BaseException:
+            limiter.release()
+            raise
+
+        overloaded = response.status_code in OVERLOAD_STATUSES
+        retry_after = _retry_after(response) if overloaded else None
+
+        assert isinstance(response.stream, AsyncByteStream)
+
+        return Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=ReleasingStream(
+                response.stream,
+                lambda: limiter.release(perf_counter() - start, overloaded, retry_after),
+            ),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+__all__ = [
+    "CONCURRENCY_CONFIG",
+    "CONCURRENCY_OVERRIDES",
+    "LIMITERS",
+    "AdaptiveLimiter",
+    "ConcurrencyConfig",
+    "LimitedTransport",
+    "host_limiter",
+    "max_concurrency",
+]
@@ -1,22 +1,23 @@
 from pathlib import Path
-from typing import Any, TypeAlias, Mapping, cast
+from typing import Any, Callable, TypeAlias, Mapping, cast
 
 from .serializer import load
 
 Config: TypeAlias = Mapping[Any, Any]
+Validator: TypeAlias = Callable[[Any], None]
 
-_configs: list[tuple[tuple[str, ...], Config]] = []
+_configs: list[tuple[tuple[str, ...], Config, Validator | None]] = []
 
 
-def add_config(key_path: str, config: Config) -> Config:
-    _configs.append((tuple(key_path.split(".")), config))
+def add_config(key_path: str, config: Config, validate: Validator | None = None) -> Config:
+    _configs.append((tuple(key_path.split(".")), config, validate))
     return config
 
 
 def load_config(path: Path) -> None:
     data = load(dict, path)
 
-    for key_path, config in _configs:
+    for key_path, config, validate in _configs:
         node = data
         for key in key_path:
             if key not in node:
@@ -26,6 +27,9 @@ def load_config(path: Path) -> None:
         else:
             cast(dict[Any, Any], config).update(node)
 
+            if validate is not None:
+                validate(config)
+
 
 __all__ = [
     "add_config",
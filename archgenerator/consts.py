@@ -1,7 +0,0 @@
-from typing import Final
-
-TASKS_CHUNK_SIZE: Final[int] = 10
-
-__all__ = [
-    "TASKS_CHUNK_SIZE",
-]
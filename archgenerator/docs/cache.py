@@ -0,0 +1,45 @@
+from hashlib import sha1
+from json import dumps, loads
+from pathlib import Path
+from typing import Any, Iterable
+
+
+def content_hash(*parts: str) -> str:
+    return sha1("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._entries: dict[str, Any] = loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        self._used: dict[str, Any] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._used or key in self._entries
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._used:
+            self._used[key] = self._entries[key]
+
+        return self._used[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._used[key] = value
+
+    def keep(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            if key in self._entries:
+                self._used.setdefault(key, self._entries[key])
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(dumps(self._used), encoding="utf-8")
+
+
+__all__ = [
+    "DiskCache",
+    "content_hash",
+]
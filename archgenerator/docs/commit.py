@@ -1,14 +1,28 @@
 from __future__ import annotations
+import os
 import re
+from io import BytesIO
+from collections import Counter
 from dataclasses import dataclass
+from difflib import unified_diff
+from functools import cached_property
+from hashlib import sha1
 from enum import Enum
 from pathlib import Path
-from typing import Any, Iterator
+from typing import Any, Collection, Iterator, cast
 
-from git import Repo, Diff
+from git import Blob, GitCmdObjectDB, GitDB, IndexFile, Repo
+from git.index.fun import stat_mode_to_index_mode
+from git.index.typ import BaseIndexEntry, IndexEntry
+from gitdb import IStream
+from more_itertools import chunked
 
 from . import context
-from .config import LANG_TO_EMOJI
+from .config import COMMIT_CONFIG, LANG_TO_EMOJI
+from .journal import load_written, reset_written
+from .manifest import Manifest, ManifestPage, load_committed_manifest, load_manifest
+from ..events import stage
+from ..tracing import span
 
 
 class ChangeType(str, Enum):
@@ -24,6 +38,9 @@ class ChangeType(str, Enum):
         return self.name.title()
 
 
+BATCH_MODES = ("none", "book", "section", "files")
+STAGING_MODES = ("all", "written")
+
 TASK_NAME_REGEX = re.compile(r"(?:## \[)(.*?)(?:])")
 LANG_EMOJI_REGEX = re.compile(r"(?:#### )(.*)")
 
@@ -32,23 +49,25 @@ LANG_EMOJI_REGEX = re.compile(r"(?:#### )(.*)")
 class UpdateInfo:
     file: Path
     change_type: ChangeType
-    diff: Diff
+    old_blob: Blob | None = None
+    page: ManifestPage | None = None
+    committed_page: ManifestPage | None = None
 
     @property
     def commit_message(self) -> str:
         return f'{self.emojies} {self.change_type!s} docs for "{self.task_name}"'
 
-    @property
+    @cached_property
     def task_name(self) -> str:
-        def get_name(source: str) -> str | None:
-            return (m := TASK_NAME_REGEX.search(source)) and m.group(1)
+        if (page := self.page or self.committed_page) is not None:
+            return page.name
 
-        name = get_name(self.commit_diff) or get_name(self.file_content)
+        name = (m := TASK_NAME_REGEX.search(self.file_content)) and m.group(1)
         assert name is not None
 
         return name
 
-    @property
+    @cached_property
     def emojies(self) -> str:
         def get_emojies(source: str) -> str:
             return "".join(
@@ -57,15 +76,55 @@ class UpdateInfo:
                 if args and (lang := args[-1].lower()) in LANG_TO_EMOJI
             )
 
-        return get_emojies(self.commit_diff) or get_emojies(self.file_content)
+        if (languages := self.changed_languages) is not None:
+            return "".join(LANG_TO_EMOJI[lang] for lang in map(str.lower, languages) if lang in LANG_TO_EMOJI)
 
-    @property
+        if self.change_type == ChangeType.UPDATE:
+            return get_emojies(self.commit_diff) or get_emojies(self.file_content)
+
+        return get_emojies(self.file_content)
+
+    @cached_property
+    def changed_languages(self) -> list[str] | None:
+        new = self.page.languages if self.page is not None else None
+        old = self.committed_page.languages if self.committed_page is not None else None
+
+        if self.change_type == ChangeType.ADD and new is not None:
+            return [*new]
+
+        if self.change_type == ChangeType.DELETE and old is not None:
+            return [*old]
+
+        if self.change_type == ChangeType.UPDATE and new is not None and old is not None:
+            changed = [lang for lang, code in new.items() if old.get(lang) != code]
+            changed += [lang for lang in old if lang not in new]
+
+            return changed or [*new]
+
+        return None
+
+    @cached_property
+    def old_content(self) -> str:
+        if self.old_blob is None:
+            return ""
+
+        return cast(bytes, self.old_blob.data_stream.read()).decode("utf-8")
+
+    @cached_property
     def file_content(self) -> str:
+        if self.change_type == ChangeType.DELETE:
+            return self.old_content
+
         return self.file.read_text("utf-8")
 
-    @property
+    @cached_property
     def commit_diff(self) -> str:
-        return self.diff.diff.decode("utf-8")  # type: ignore
+        return "".join(
+            unified_diff(
+                self.old_content.splitlines(keepends=True),
+                self.file_content.splitlines(keepends=True),
+            )
+        )
 
 
 def configure_repo(repo: Repo) -> None:
@@ -77,28 +136,224 @@ def configure_repo(repo: Repo) -> None:
             repo.config_writer().set_value("user", option, value).release()
 
 
-def get_dirty_task_docs(repo: Repo) -> Iterator[UpdateInfo]:
-    for diff in repo.head.commit.diff(create_patch=True):
-        file: Path = Path(repo.working_dir) / (diff.b_path or diff.a_path)
+def is_task_doc(file: Path) -> bool:
+    return file.suffix == ".md" and file.stem not in ("README", "SUMMARY")
+
+
+def blob_sha(file: str) -> bytes:
+    with open(file, "rb") as f:
+        data = f.read()
+
+    return sha1(b"blob %d\0" % len(data) + data).digest()
+
+
+def get_written_changes(
+    index: IndexFile,
+    written: Collection[str],
+    manifest: Manifest,
+    committed: Manifest,
+) -> tuple[list[UpdateInfo], list[UpdateInfo]]:
+    repo = index.repo
+    root = Path(repo.working_dir)
+
+    entries = {cast(str, path): entry for (path, stage), entry in index.entries.items() if stage == 0}
+    untracked = [path for path in written if path not in entries and os.path.isfile(os.path.join(root, path))]
+    ignored = {*repo.ignored(*untracked)} if untracked else set()
+
+    changes = [
+        UpdateInfo(
+            root / path,
+            ChangeType.ADD,
+            page=manifest.pages.get(path),
+            committed_page=committed.pages.get(path),
+        )
+        for path in untracked
+        if path not in ignored
+    ]
+    changes += [
+        UpdateInfo(
+            root / path,
+            ChangeType.UPDATE,
+            Blob(repo, entry.binsha, entry.mode, path),
+            page=manifest.pages.get(path),
+            committed_page=committed.pages.get(path),
+        )
+        for path in written
+        if (entry := entries.get(path)) is not None
+        and os.path.isfile(file := os.path.join(root, path))
+        and entry.binsha != blob_sha(file)
+    ]
+    changes += [
+        UpdateInfo(
+            root / path,
+            ChangeType.DELETE,
+            Blob(repo, entry.binsha, entry.mode, path),
+            committed_page=committed.pages.get(path),
+        )
+        for path, entry in entries.items()
+        if not os.path.lexists(os.path.join(root, path))
+    ]
+    changes.sort(key=lambda info: info.file)
+
+    return [c for c in changes if is_task_doc(c.file)], [c for c in changes if not is_task_doc(c.file)]
+
+
+def get_dirty_task_docs(repo: Repo, manifest: Manifest, committed: Manifest) -> Iterator[UpdateInfo]:
+    for diff in repo.head.commit.diff():
+        path = cast(str, diff.b_path or diff.a_path)
+        file: Path = Path(repo.working_dir) / path
+
+        if is_task_doc(file):
+            yield UpdateInfo(
+                file,
+                ChangeType(diff.change_type),
+                diff.a_blob,
+                page=manifest.pages.get(path),
+                committed_page=committed.pages.get(path),
+            )
+
+
+def batch_updates(repo: Repo, updates: list[UpdateInfo], mode: str, size: int) -> list[list[UpdateInfo]]:
+    if mode not in BATCH_MODES:
+        raise ValueError(f"Unknown batch mode {mode!r}")
 
-        if file.suffix == ".md" and file.stem not in ("README", "SUMMARY"):
-            yield UpdateInfo(file, ChangeType(diff.change_type), diff)
+    if not updates:
+        return []
 
+    if mode == "none":
+        return [updates]
 
-def commit_docs(repo_path: Path, push_commit: bool = False) -> None:
-    repo = Repo(repo_path)
-    repo.git.add(repo_path)
+    if mode == "files":
+        if size < 1:
+            raise ValueError(f"Batch size must be at least 1, got {size}")
+
+        return [*chunked(updates, size)]
+
+    depth = 1 if mode == "book" else 2
+
+    batches: dict[tuple[str, ...], list[UpdateInfo]] = {}
+    for info in updates:
+        batches.setdefault(info.file.relative_to(repo.working_dir).parts[:depth], []).append(info)
+
+    return [*batches.values()]
+
+
+def batch_message(batch: list[UpdateInfo], limit: int) -> str:
+    if len(batch) <= limit:
+        return "\n".join(info.commit_message for info in batch)
+
+    counts = Counter(info.change_type for info in batch)
+    return "\n".join(
+        [
+            f"Update docs for {len(batch)} tasks",
+            "",
+            *(f"{change_type!s}: {count}" for change_type, count in counts.items()),
+        ]
+    )
+
+
+def stage_batch(index: IndexFile, batch: list[UpdateInfo]) -> None:
+    if files := [str(info.file) for info in batch if info.change_type != ChangeType.DELETE]:
+        index.add(files, write=False)
+
+    for info in batch:
+        if info.change_type == ChangeType.DELETE:
+            index.entries.pop((info.file.relative_to(index.repo.working_dir).as_posix(), 0), None)
+
+    index.write(ignore_extension_data=True)
+
+
+def store_blob(repo: Repo, file: Path, path: str) -> IndexEntry:
+    data = file.read_bytes()
+    stream = repo.odb.store(IStream(Blob.type, len(data), BytesIO(data)))
+    mode = stat_mode_to_index_mode(os.lstat(file).st_mode)
+
+    return IndexEntry.from_base(BaseIndexEntry((mode, stream.binsha, 0, path)))
+
+
+def stage_written(index: IndexFile, batch: list[UpdateInfo]) -> IndexFile:
+    repo = index.repo
+
+    for info in batch:
+        path = info.file.relative_to(repo.working_dir).as_posix()
+
+        if info.change_type == ChangeType.DELETE:
+            index.entries.pop((path, 0), None)
+        elif info.change_type == ChangeType.UPDATE:
+            index.entries[(path, 0)] = store_blob(repo, info.file, path)
+
+    if untracked := [str(info.file) for info in batch if info.change_type == ChangeType.ADD]:
+        index.write(ignore_extension_data=True)
+        repo.git.add("--", *untracked)
+        index = repo.index
+
+    return index
+
+
+@stage("commit")
+def commit_docs(
+    repo_path: Path,
+    push_commit: bool = False,
+    batch: str | None = None,
+    batch_size: int | None = None,
+    staging: str | None = None,
+) -> None:
+    if (staging := staging or COMMIT_CONFIG["staging"]) not in STAGING_MODES:
+        raise ValueError(f"Unknown staging mode {staging!r}")
+
+    rest: list[UpdateInfo] | None = None
+    written = load_written(repo_path) if staging == "written" else None
+
+    repo = Repo(repo_path, odbt=GitCmdObjectDB if written is None else GitDB)
     configure_repo(repo)
 
-    commit_message = "\n".join(info.commit_message for info in get_dirty_task_docs(repo))
+    cache = repo_path / context.CACHE_DIR
+    manifest, committed = load_manifest(cache), load_committed_manifest(repo, cache)
+
+    if written is not None:
+        index = repo.index
+        updates, rest = get_written_changes(index, written, manifest, committed)
+    else:
+        repo.git.add(repo_path)
+        index = repo.index
+        updates = [*get_dirty_task_docs(repo, manifest, committed)]
+
+    batches = batch_updates(
+        repo,
+        updates,
+        batch or COMMIT_CONFIG["batch"],
+        batch_size or COMMIT_CONFIG["batch_size"],
+    )
+    messages = [batch_message(b, COMMIT_CONFIG["message_limit"]) for b in batches]
+
+    if rest is None and len(batches) > 1:
+        index.reset()
+
+    for i, (b, message) in enumerate(zip(batches, messages), start=1):
+        with span("commit_batch", batch=i, files=len(b)):
+            if rest is not None:
+                index = stage_written(index, [*b, *rest] if i == len(batches) else b)
+            elif i < len(batches):
+                stage_batch(index, b)
+            elif len(batches) > 1:
+                repo.git.add(repo_path)
+                index = repo.index
+
+            index.commit(message)
+
+    if rest is not None and messages:
+        index.write(ignore_extension_data=True)
 
-    if commit_message:
-        repo.index.commit(commit_message)
+    if messages:
+        reset_written(repo_path)
 
-        if push_commit:
+    if messages and push_commit:
+        with span("push"):
             repo.remote().push()
 
 
 __all__ = [
+    "BATCH_MODES",
+    "STAGING_MODES",
     "commit_docs",
 ]
@@ -1,9 +1,42 @@
+from typing import TypedDict
+
 from ..configurator import add_config
 
-CONFIG = {
+
+class DocsConfig(TypedDict):
+    title: str
+    workers: int
+    summary: str
+    search: bool
+
+
+class CommitConfig(TypedDict):
+    batch: str
+    batch_size: int
+    message_limit: int
+    staging: str
+
+
+CONFIG: DocsConfig = {
     "title": "Coding Challenges ⭐",
+    "workers": 1,
+    "summary": "single",
+    "search": True,
 }
 
+COMMIT_CONFIG: CommitConfig = {
+    "batch": "none",
+    "batch_size": 500,
+    "message_limit": 500,
+    "staging": "all",
+}
+
+
+def validate_commit_config(config: CommitConfig) -> None:
+    if config["batch_size"] < 1:
+        raise ValueError(f"docs.commit.batch_size must be at least 1, got {config['batch_size']}")
+
+
 LANG_TO_PRETTY_LANG = {
     "javascript": "JavaScript",
     "coffeescript": "CoffeeScript",
@@ -26,11 +59,16 @@ LANG_TO_EMOJI = {
 }
 
 add_config("docs.config", CONFIG)
+add_config("docs.commit", COMMIT_CONFIG, validate_commit_config)
 add_config("docs.lang_to_emoji", LANG_TO_EMOJI)
 add_config("docs.lang_to_pretty_lang", LANG_TO_PRETTY_LANG)
 
 __all__ = [
+    "COMMIT_CONFIG",
     "CONFIG",
+    "CommitConfig",
+    "DocsConfig",
     "LANG_TO_EMOJI",
     "LANG_TO_PRETTY_LANG",
+    "validate_commit_config",
 ]
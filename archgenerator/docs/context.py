@@ -1,32 +1,61 @@
+import os
 import shutil
+from contextlib import suppress
 from contextvars import ContextVar
 from pathlib import Path
+from typing import Collection
 
 from .config import CONFIG
+from .manifest import MANIFEST_FILE
 from ..serializer import dump
 
+CACHE_DIR = ".archgenerator"
+SEARCH_DIR = "_search"
+
 GIT_USERNAME: ContextVar[str | None] = ContextVar("GIT_USERNAME")
 GIT_EMAIL: ContextVar[str | None] = ContextVar("GIT_EMAIL")
 
 DOCS: ContextVar[Path] = ContextVar("DOCS")
 STYLES_ROOT: ContextVar[Path] = ContextVar("STYLES_ROOT")
 WEBSITE_CSS: ContextVar[Path] = ContextVar("WEBSITE_CSS")
+SEARCH_ROOT: ContextVar[Path] = ContextVar("SEARCH_ROOT")
+CACHE: ContextVar[Path] = ContextVar("CACHE")
+
+
+def _prune(path: Path, root: Path, keep: Collection[str]) -> None:
+    for parent, _, files in os.walk(path, topdown=False):
+        prefix = Path(parent).relative_to(root).as_posix()
+
+        for file in files:
+            if f"{prefix}/{file}" not in keep:
+                os.unlink(os.path.join(parent, file))
 
+        with suppress(OSError):
+            os.rmdir(parent)
 
-def init_context(root: Path) -> None:
+
+def init_context(root: Path, keep: Collection[str] = ()) -> None:
     DOCS.set(root)
     STYLES_ROOT.set(root / "styles")
     WEBSITE_CSS.set(root / "styles" / "website.css")
+    SEARCH_ROOT.set(root / SEARCH_DIR)
+    CACHE.set(root / CACHE_DIR)
+
+    shutil.rmtree(STYLES_ROOT.get(), ignore_errors=True)
 
-    for p in [*DOCS.get().iterdir(), STYLES_ROOT.get()]:
+    for p in DOCS.get().iterdir():
         if not p.name.startswith(".") and p.is_dir():
-            shutil.rmtree(p, ignore_errors=True)
+            _prune(p, root, keep)
 
     STYLES_ROOT.get().mkdir(parents=True)
     WEBSITE_CSS.get().touch()
 
     (root / "README.md").touch(exist_ok=True)
 
+    CACHE.get().mkdir(exist_ok=True)
+    (CACHE.get() / MANIFEST_FILE).unlink(missing_ok=True)
+    (CACHE.get() / ".gitignore").write_text(f"*\n!{MANIFEST_FILE}\n", encoding="utf-8")
+
     dump(
         obj={
             "title": CONFIG["title"],
@@ -40,7 +69,11 @@ def init_context(root: Path) -> None:
 
 __all__ = [
     "init_context",
+    "CACHE",
+    "CACHE_DIR",
     "DOCS",
+    "SEARCH_DIR",
+    "SEARCH_ROOT",
     "STYLES_ROOT",
     "WEBSITE_CSS",
     "GIT_EMAIL",
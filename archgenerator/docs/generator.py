@@ -1,133 +1,245 @@
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import cast, Iterator
+from typing import Collection, Iterable, Iterator
 
 from . import context, md
-from .config import CONFIG, LANG_TO_EMOJI, LANG_TO_PRETTY_LANG
-from .names import valid_name, reset_names
+from .cache import DiskCache, content_hash
+from .config import CONFIG
+from .journal import record_written
+from .manifest import MANIFEST_FILE, build_manifest, load_manifest, write_manifest
+from .names import NameTable
+from .search import generate_search_index, unchanged_shards
+from .templates import PageTemplate
 from ..models import Book, Section, Task
+from ..tracing import span
+from ..events import stage
 
 MD_IF_REGEX = re.compile(r"(?:[`~]{3}\s*)(if(?:-not)?):(.*?)\n(.*?)(?:[`~]{3})", re.MULTILINE | re.DOTALL)
 STYLE_REGEX = re.compile(r"<style(?:.*?)>(.*?)</style>", re.MULTILINE | re.DOTALL)
+PREPROCESS_REGEX = re.compile(f"{MD_IF_REGEX.pattern}|{STYLE_REGEX.pattern}", re.MULTILINE | re.DOTALL)
 
+SUMMARY_MODES = ("single", "book", "section")
 
-def extract_css_styles(content: str) -> str:
-    styles = STYLE_REGEX.findall(content)
-
-    if styles:
-        content = STYLE_REGEX.sub("", content)
 
+def add_styles(styles: Iterable[str]) -> None:
+    with context.WEBSITE_CSS.get().open("a", encoding="utf-8") as f:
         for style in styles:
-            add_styles(style)
+            f.write(f"\n{style}")
 
-    return content
 
+def preprocess_description(description: str, languages: Collection[str]) -> tuple[str, list[str]]:
+    supported_langs = {*languages}
+    styles: list[str] = []
 
-def add_styles(style: str) -> None:
-    style_path = context.WEBSITE_CSS.get()
+    def style_replacer(match: re.Match[str]) -> str:
+        styles.append(match.group(1))
+        return ""
 
-    old_styles = style_path.read_text(encoding="utf-8")
-    style_path.write_text(f"{old_styles}\n{style}", encoding="utf-8")
+    def replacer(match: re.Match[str]) -> str:
+        if_type, langs, if_content, style = match.groups()
 
+        if if_type is None:
+            styles.append(style)
+            return ""
 
-def solve_if_logic(task: Task) -> str:
-    if (desc := task.description) and MD_IF_REGEX.search(desc):
-        supported_lags = {*task.solutions}
+        if (if_type == "if") == bool(supported_langs & {*langs.strip().split(",")}):
+            return STYLE_REGEX.sub(style_replacer, if_content)
 
-        def replacer(match: re.Match[str]) -> str:
-            if_type, langs, if_content = match.groups()
-            if_langs = {*langs.strip().split(",")}
+        return ""
 
-            if (if_type == "if") == bool(supported_lags & if_langs):
-                return cast(str, if_content)
+    return PREPROCESS_REGEX.sub(replacer, description), styles
 
-            return ""
 
-        return MD_IF_REGEX.sub(replacer, desc)
+def description_key(task: Task) -> str:
+    return content_hash(task.description or "", ",".join(sorted(task.solutions)))
 
-    assert desc is not None
-    return desc
 
+def render_task(
+    path: Path,
+    task: Task,
+    template: PageTemplate,
+    preprocessed: tuple[str, list[str]] | None = None,
+) -> tuple[str, list[str]]:
+    if preprocessed is None:
+        assert task.description is not None
+        preprocessed = preprocess_description(task.description, task.solutions)
 
-def generate_task(parent: Path, task: Task) -> None:
-    def _generate_task() -> Iterator[str | None]:
-        yield md.header(md.link(task.name, task.link))
-        yield None
-        yield extract_css_styles(solve_if_logic(task))
-        yield None
-        yield md.header("Solutions")
+    description, styles = preprocessed
+    path.write_text(template.render(task, description), encoding="utf-8")
 
-        for lang, (solution, *_) in task.solutions.items():
-            pretty_lang = LANG_TO_PRETTY_LANG.get(lang.lower(), lang.title())
+    return description, styles
 
-            yield md.header(f"{LANG_TO_EMOJI[lang.lower()]} {pretty_lang}", important=4)
-            yield md.code(solution.code, lang)
 
-        yield None
+def generate_section(section: Section, names: NameTable) -> Iterator[tuple[str, Task]]:
+    root = context.DOCS.get() / names[section]
+    root.mkdir(parents=True, exist_ok=True)
 
-    md.readme(parent, _generate_task(), f"{valid_name(task.name, unique=True)}.md")
+    for task in section.tasks:
+        yield names[task], task
 
 
-def generate_section(parent: Path, section: Section) -> None:
-    root = parent / valid_name(section.name, lower=True)
-    root.mkdir(parents=True, exist_ok=True)
+def generate_book(book: Book, names: NameTable) -> Iterator[tuple[str, Task]]:
+    for section in book.sections:
+        yield from generate_section(section, names)
 
-    for task in section.tasks:
-        generate_task(root, task)
 
+def generate_pages(
+    pages: list[tuple[str, Task]],
+    template: PageTemplate,
+    descriptions: DiskCache,
+    workers: int = 1,
+    unchanged: Collection[str] = (),
+) -> list[str]:
+    root = context.DOCS.get()
 
-def generate_book(book: Book) -> None:
-    root = context.DOCS.get() / valid_name(book.name, lower=True)
+    keys = [description_key(task) for _, task in pages]
+    styles: list[list[str]] = [descriptions[key][1] if key in descriptions else [] for key in keys]
 
-    for section in book.sections:
-        generate_section(root, section)
+    missing = [
+        i for i, ((path, _), key) in enumerate(zip(pages, keys)) if path not in unchanged or key not in descriptions
+    ]
+    args = (
+        (root / pages[i][0] for i in missing),
+        (pages[i][1] for i in missing),
+        repeat(template),
+        (descriptions.get(keys[i]) for i in missing),
+    )
 
+    workers = min(workers, os.cpu_count() or 1)
 
-def generate_summary(books: list[Book]) -> None:
-    def section_summary(parent: str, section: Section) -> Iterator[str | None]:
-        yield md.option(
-            md.link(
-                name=section.name,
-                url=f"/{parent}/{valid_name(section.name, lower=True)}",
-                wrap=True,
-            )
-        )
+    if workers > 1 and len(missing) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rendered = [*executor.map(render_task, *args, chunksize=max(1, len(missing) // (workers * 4)))]
+    else:
+        rendered = [*map(render_task, *args)]
 
+    for i, (description, page_styles) in zip(missing, rendered):
+        descriptions[keys[i]] = (description, page_styles)
+        styles[i] = page_styles
+
+    add_styles(style for page_styles in styles for style in page_styles)
+
+    return [pages[i][0] for i in missing]
+
+
+def generate_summary(names: NameTable, mode: str = "single") -> list[str]:
+    if mode not in SUMMARY_MODES:
+        raise ValueError(f"Unknown summary mode {mode!r}")
+
+    def tasks_summary(section: Section, ident: int = 0) -> Iterator[str | None]:
         for task in section.tasks:
-            yield md.option(
-                md.link(
-                    name=task.name,
-                    url=f"/{parent}/{valid_name(section.name, lower=True)}/{valid_name(task.name, unique=True)}.md",
-                    wrap=True,
-                ),
-                ident=4,
-            )
+            yield md.option(md.link(name=task.name, url=f"/{names[task]}", wrap=True), ident=ident)
+
+    def section_summary(section: Section) -> Iterator[str | None]:
+        yield md.option(md.link(name=section.name, url=f"/{names[section]}", wrap=True))
+        yield from tasks_summary(section, ident=4)
 
     def book_summary(book: Book) -> Iterator[str | None]:
         yield None
         yield md.header(book.name)
 
         for section in book.sections:
-            yield from section_summary(valid_name(book.name, lower=True), section)
+            if mode == "section":
+                yield md.option(md.link(name=section.name, url=f"/{names[section]}/README.md", wrap=True))
+            else:
+                yield from section_summary(section)
 
     def summary() -> Iterator[str | None]:
         yield md.header(CONFIG["title"], important=1)
 
-        for book in books:
-            yield from book_summary(book)
+        for book in names.books:
+            if mode == "book":
+                yield md.option(md.link(name=book.name, url=f"/{names[book]}/README.md", wrap=True))
+            else:
+                yield from book_summary(book)
+
+    def book_index(book: Book) -> Iterator[str | None]:
+        yield md.header(book.name, important=1)
+        yield None
+
+        for section in book.sections:
+            yield from section_summary(section)
+
+    def section_index(section: Section) -> Iterator[str | None]:
+        yield md.header(section.name, important=1)
+        yield None
+        yield from tasks_summary(section)
+
+    root = context.DOCS.get()
+    md.readme(root, summary(), "SUMMARY.md")
+
+    written = ["SUMMARY.md"]
+    for book in names.books:
+        if mode == "book":
+            md.readme(root / names[book], book_index(book))
+            written.append(f"{names[book]}/README.md")
+        elif mode == "section":
+            for section in book.sections:
+                md.readme(root / names[section], section_index(section))
+                written.append(f"{names[section]}/README.md")
+
+    return written
+
+
+@stage("docs")
+def generate_docs(
+    books: list[Book],
+    docs_path: Path,
+    workers: int | None = None,
+    summary: str | None = None,
+) -> None:
+    names = NameTable(books)
+    template = PageTemplate.compile()
+
+    previous = load_manifest(docs_path / context.CACHE_DIR)
+    manifest = build_manifest(names, template.version)
+
+    unchanged = {
+        path
+        for path, page in manifest.pages.items()
+        if (old := previous.pages.get(path)) is not None
+        and old.digest == page.digest
+        and os.path.exists(os.path.join(docs_path, path))
+    }
+
+    shards = unchanged_shards(names, manifest, previous) if CONFIG["search"] else set()
+
+    context.init_context(docs_path, unchanged | shards)
+
+    written = ["README.md", "book.json", "styles/website.css"]
+
+    with span("summary"):
+        written += generate_summary(names, summary or CONFIG["summary"])
+
+    descriptions = DiskCache(context.CACHE.get() / "descriptions.json")
+
+    with span("render", unchanged=len(unchanged)):
+        pages = [page for book in names.books for page in generate_book(book, names)]
+        written += generate_pages(
+            pages,
+            template,
+            descriptions,
+            workers or CONFIG["workers"],
+            unchanged,
+        )
 
-    md.readme(context.DOCS.get(), summary(), "SUMMARY.md")
-    reset_names()
+    descriptions.save()
 
+    if CONFIG["search"]:
+        with span("search"):
+            tokens = DiskCache(context.CACHE.get() / "tokens.json")
+            written += generate_search_index(names, manifest, tokens, shards)
+            tokens.save()
 
-def generate_docs(books: list[Book], docs_path: Path) -> None:
-    context.init_context(docs_path)
-    generate_summary(books)
+    write_manifest(manifest, context.CACHE.get())
 
-    for book in sorted(books, key=lambda b: b.name):
-        generate_book(book)
+    record_written(docs_path, [*written, f"{context.CACHE_DIR}/{MANIFEST_FILE}"])
 
 
 __all__ = [
+    "SUMMARY_MODES",
     "generate_docs",
 ]
@@ -0,0 +1,39 @@
+from json import dumps, loads
+from pathlib import Path
+from typing import Iterable
+
+from .context import CACHE_DIR
+
+JOURNAL_FILE = "written.json"
+
+
+def _journal_path(root: Path) -> Path:
+    return root / CACHE_DIR / JOURNAL_FILE
+
+
+def load_written(root: Path) -> set[str] | None:
+    try:
+        return {*loads(_journal_path(root).read_text("utf-8"))}
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def record_written(root: Path, paths: Iterable[str]) -> None:
+    if (written := load_written(root)) is None:
+        return
+
+    written.update(paths)
+    _journal_path(root).write_text(dumps(sorted(written), ensure_ascii=False), encoding="utf-8")
+
+
+def reset_written(root: Path) -> None:
+    if (path := _journal_path(root)).parent.is_dir():
+        path.write_text("[]", encoding="utf-8")
+
+
+__all__ = [
+    "JOURNAL_FILE",
+    "load_written",
+    "record_written",
+    "reset_written",
+]
@@ -0,0 +1,109 @@
+from json import dumps, loads
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+
+from dataclasses import field
+
+from git import Repo
+
+from .cache import content_hash
+from .names import NameTable
+from ..models import Book, Section, Task
+from ..serializer import load
+
+if TYPE_CHECKING:
+    from dataclasses import dataclass
+else:
+    from pydantic.dataclasses import dataclass
+
+MANIFEST_FILE = "manifest.json"
+
+
+@dataclass
+class ManifestPage:
+    book: str
+    section: str
+    name: str
+    digest: str = ""
+    languages: dict[str, str] = field(default_factory=dict)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "book": self.book,
+            "section": self.section,
+            "name": self.name,
+            "digest": self.digest,
+            "languages": self.languages,
+        }
+
+
+@dataclass
+class Manifest:
+    pages: dict[str, ManifestPage] = field(default_factory=dict)
+
+
+def build_page(book: Book, section: Section, task: Task, version: str) -> ManifestPage:
+    languages = {language: content_hash(solution.code) for language, (solution, *_) in task.solutions.items()}
+
+    return ManifestPage(
+        book=book.name,
+        section=section.name,
+        name=task.name,
+        digest=content_hash(
+            version,
+            task.name,
+            task.link,
+            task.description or "",
+            *(part for language in languages.items() for part in language),
+        ),
+        languages=languages,
+    )
+
+
+def build_manifest(names: NameTable, version: str) -> Manifest:
+    return Manifest(
+        pages={
+            names[task]: build_page(book, section, task, version)
+            for book in names.books
+            for section in book.sections
+            for task in section.tasks
+        }
+    )
+
+
+def _dump(obj: Any) -> str:
+    return dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def write_manifest(manifest: Manifest, cache: Path) -> None:
+    pages = ",\n".join(f"{_dump(path)}:{_dump(page.to_json())}" for path, page in manifest.pages.items())
+
+    (cache / MANIFEST_FILE).write_text(f'{{"pages":{{\n{pages}\n}}}}\n', encoding="utf-8")
+
+
+def load_manifest(cache: Path) -> Manifest:
+    path = cache / MANIFEST_FILE
+    return load(Manifest, path) if path.exists() else Manifest()
+
+
+def load_committed_manifest(repo: Repo, cache: Path) -> Manifest:
+    path = (cache / MANIFEST_FILE).relative_to(repo.working_dir).as_posix()
+
+    try:
+        blob = repo.head.commit.tree / path
+    except (KeyError, ValueError):
+        return Manifest()
+
+    return Manifest(**loads(cast(bytes, blob.data_stream.read())))
+
+
+__all__ = [
+    "MANIFEST_FILE",
+    "Manifest",
+    "ManifestPage",
+    "build_manifest",
+    "build_page",
+    "load_committed_manifest",
+    "load_manifest",
+    "write_manifest",
+]
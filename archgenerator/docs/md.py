@@ -19,11 +19,18 @@ def code(content: str, lang: str) -> str:
     return f"```{lang}\n{content}\n```"
 
 
+WRITE_BUFFER_SIZE = 1 << 16
+
+
 def readme(root: Path, content: Iterable[str | None], name: str = "README.md") -> None:
     root.mkdir(parents=True, exist_ok=True)
 
-    readme_path = root / name
-    readme_path.write_text("\n".join(s or "" for s in content), encoding="utf-8")
+    with (root / name).open("w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+        for i, line in enumerate(content):
+            if i:
+                f.write("\n")
+
+            f.write(line or "")
 
 
 __all__ = [
@@ -1,36 +1,62 @@
+import re
 from collections import Counter
 from string import punctuation
+from typing import Iterable
 
-PATH_CHARACTERS_TO_REPLACE = {*punctuation, " "} - {"-"}
-
-_NAMES_CACHE: Counter[str] = Counter()
+from ..models import Book, Section, Task
 
+PATH_CHARACTERS_TO_REPLACE = {*punctuation, " "} - {"-"}
+PATH_TRANSLATION = str.maketrans(dict.fromkeys(PATH_CHARACTERS_TO_REPLACE, "-"))
+DASHES_REGEX = re.compile(r"-{2,}")
 
-def valid_name(name: str, unique: bool = False, lower: bool = False) -> str:
-    for p in PATH_CHARACTERS_TO_REPLACE:
-        name = name.replace(p, "-")
 
-    name = name.replace(" ", "-").encode(encoding="ascii", errors="ignore").decode(encoding="ascii").strip("-")
+def valid_name(name: str, lower: bool = False) -> str:
+    name = name.translate(PATH_TRANSLATION).encode(encoding="ascii", errors="ignore").decode(encoding="ascii")
+    name = name.strip("-")
 
     if lower:
         name = name.lower()
 
-    while "--" in name:
-        name = name.replace("--", "-")
+    return DASHES_REGEX.sub("-", name)
+
+
+class NameTable:
+    def __init__(self, books: Iterable[Book]) -> None:
+        self._books = sorted(books, key=lambda b: b.name)
+        self._paths: dict[int, str] = {}
+
+        self._counter: Counter[str] = Counter()
+        taken: set[str] = set()
+
+        for book in self._books:
+            book_path = self._paths[id(book)] = self._unique(valid_name(book.name, lower=True), taken)
+            taken.add(book_path)
+
+            for section in book.sections:
+                section_name = self._unique(valid_name(section.name, lower=True), taken, f"{book_path}/")
+                section_path = self._paths[id(section)] = f"{book_path}/{section_name}"
+                taken.add(section_path)
+
+                for task in section.tasks:
+                    self._paths[id(task)] = f"{section_path}/{self._unique(valid_name(task.name))}.md"
 
-    key = name.lower()
-    if unique and key in _NAMES_CACHE:
-        name = name + f"_{_NAMES_CACHE[key]}"
+    def _unique(self, name: str, taken: set[str] | None = None, prefix: str = "") -> str:
+        key = name.lower()
+        if key in self._counter and (taken is None or f"{prefix}{name}" in taken):
+            name = name + f"_{self._counter[key]}"
 
-    _NAMES_CACHE[key] += 1
-    return name
+        self._counter[key] += 1
+        return name
 
+    @property
+    def books(self) -> list[Book]:
+        return self._books
 
-def reset_names() -> None:
-    _NAMES_CACHE.clear()
+    def __getitem__(self, item: Book | Section | Task) -> str:
+        return self._paths[id(item)]
 
 
 __all__ = [
+    "NameTable",
     "valid_name",
-    "reset_names",
 ]
@@ -0,0 +1,94 @@
+import re
+from collections import defaultdict
+from json import dumps
+from typing import Any, Collection, cast
+
+from . import context
+from .cache import DiskCache, content_hash
+from .manifest import Manifest, ManifestPage
+from .names import NameTable
+from ..models import Book, Section, Task
+
+TAG_REGEX = re.compile(r"<[^>]*>")
+TOKEN_REGEX = re.compile(r"[^\W_]{2,}")
+
+
+def tokenize(*texts: str) -> list[str]:
+    return sorted({token for text in texts for token in TOKEN_REGEX.findall(TAG_REGEX.sub(" ", text).lower())})
+
+
+def tokens_key(section: Section, page: ManifestPage) -> str:
+    return content_hash(page.digest, section.name)
+
+
+def task_tokens(task: Task, section: Section, page: ManifestPage, tokens: DiskCache) -> list[str]:
+    if (key := tokens_key(section, page)) not in tokens:
+        tokens[key] = tokenize(task.name, section.name, " ".join(task.solutions), task.description or "")
+
+    return cast(list[str], tokens[key])
+
+
+def shard_path(names: NameTable, book: Book) -> str:
+    return f"{context.SEARCH_DIR}/{names[book]}.json"
+
+
+def _book_pages(manifest: Manifest, book: Book) -> list[tuple[str, ManifestPage]]:
+    return [(path, page) for path, page in manifest.pages.items() if page.book == book.name]
+
+
+def unchanged_shards(names: NameTable, manifest: Manifest, previous: Manifest) -> set[str]:
+    return {
+        shard_path(names, book) for book in names.books if _book_pages(manifest, book) == _book_pages(previous, book)
+    }
+
+
+def _dump(obj: Any) -> str:
+    return dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def generate_search_index(
+    names: NameTable,
+    manifest: Manifest,
+    tokens: DiskCache,
+    unchanged: Collection[str] = (),
+) -> list[str]:
+    root = context.SEARCH_ROOT.get()
+    root.mkdir(parents=True, exist_ok=True)
+
+    shards, written = [], [f"{context.SEARCH_DIR}/index.json"]
+    for book in names.books:
+        shards.append({"book": book.name, "shard": (path := shard_path(names, book))})
+
+        if path in unchanged:
+            tokens.keep(
+                tokens_key(section, manifest.pages[names[task]]) for section in book.sections for task in section.tasks
+            )
+            continue
+
+        docs: list[Any] = []
+        index: defaultdict[str, list[int]] = defaultdict(list)
+
+        for section in book.sections:
+            for task in section.tasks:
+                for token in task_tokens(task, section, manifest.pages[names[task]], tokens):
+                    index[token].append(len(docs))
+
+                docs.append([names[task], task.name, section.name, [*task.solutions]])
+
+        (context.DOCS.get() / path).write_text(
+            _dump({"book": book.name, "docs": docs, "index": index}),
+            encoding="utf-8",
+        )
+        written.append(path)
+
+    (root / "index.json").write_text(_dump(shards), encoding="utf-8")
+
+    return written
+
+
+__all__ = [
+    "generate_search_index",
+    "shard_path",
+    "tokenize",
+    "unchanged_shards",
+]
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from hashlib import sha1
+from json import dumps
+from string import Template
+
+from .config import LANG_TO_EMOJI, LANG_TO_PRETTY_LANG
+from ..configurator import add_config
+from ..models import Task
+
+TEMPLATE_VERSION = 1
+
+TEMPLATES = {
+    "task": "## [$name]($link)\n\n$description\n\n## Solutions\n$solutions",
+    "solution": "#### $emoji $pretty_language\n```$language\n$code\n```\n",
+}
+
+add_config("docs.templates", TEMPLATES)
+
+
+@dataclass(frozen=True)
+class PageTemplate:
+    task: Template
+    solution: Template
+    lang_to_emoji: dict[str, str]
+    lang_to_pretty_lang: dict[str, str]
+
+    @classmethod
+    def compile(cls) -> PageTemplate:
+        return cls(
+            task=Template(TEMPLATES["task"]),
+            solution=Template(TEMPLATES["solution"]),
+            lang_to_emoji={**LANG_TO_EMOJI},
+            lang_to_pretty_lang={**LANG_TO_PRETTY_LANG},
+        )
+
+    @property
+    def version(self) -> str:
+        source = dumps(
+            [
+                TEMPLATE_VERSION,
+                self.task.template,
+                self.solution.template,
+                self.lang_to_emoji,
+                self.lang_to_pretty_lang,
+            ],
+            sort_keys=True,
+        )
+
+        return sha1(source.encode("utf-8")).hexdigest()
+
+    def render_solution(self, language: str, code: str) -> str:
+        return self.solution.substitute(
+            emoji=self.lang_to_emoji[language.lower()],
+            pretty_language=self.lang_to_pretty_lang.get(language.lower(), language.title()),
+            language=language,
+            code=code,
+        )
+
+    def render(self, task: Task, description: str) -> str:
+        return self.task.substitute(
+            name=task.name,
+            link=task.link,
+            description=description,
+            solutions="".join(
+                self.render_solution(language, solution.code) for language, (solution, *_) in task.solutions.items()
+            ),
+        )
+
+
+__all__ = [
+    "PageTemplate",
+    "TEMPLATES",
+    "TEMPLATE_VERSION",
+]
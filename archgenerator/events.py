@@ -0,0 +1,77 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import Enum
+from time import perf_counter, time
+from typing import Any, Callable, Iterator
+
+
+class EventType(str, Enum):
+    REQUEST_START = "request.start"
+    REQUEST_END = "request.end"
+    CACHE_HIT = "cache.hit"
+    CACHE_MISS = "cache.miss"
+    CACHE_STATS = "cache.stats"
+    RETRY = "retry"
+    TASK_FETCHED = "task.fetched"
+    STAGE_START = "stage.start"
+    STAGE_END = "stage.end"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+@dataclass(frozen=True)
+class Event:
+    type: EventType
+    platform: str | None
+    data: dict[str, Any] = field(default_factory=dict)
+    time: float = field(default_factory=time)
+
+
+Subscriber = Callable[[Event], Any]
+
+CURRENT_PLATFORM: ContextVar[str | None] = ContextVar("CURRENT_PLATFORM", default=None)
+
+_subscribers: list[Subscriber] = []
+
+
+def subscribe(subscriber: Subscriber) -> Callable[[], None]:
+    _subscribers.append(subscriber)
+
+    def unsubscribe() -> None:
+        if subscriber in _subscribers:
+            _subscribers.remove(subscriber)
+
+    return unsubscribe
+
+
+def emit(type: EventType, platform: str | None = None, **data: Any) -> None:
+    if not _subscribers:
+        return
+
+    event = Event(type, platform or CURRENT_PLATFORM.get(), data)
+    for subscriber in [*_subscribers]:
+        subscriber(event)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    emit(EventType.STAGE_START, stage=name)
+    start = perf_counter()
+
+    try:
+        yield
+    finally:
+        emit(EventType.STAGE_END, stage=name, seconds=perf_counter() - start)
+
+
+__all__ = [
+    "CURRENT_PLATFORM",
+    "Event",
+    "EventType",
+    "Subscriber",
+    "emit",
+    "stage",
+    "subscribe",
+]
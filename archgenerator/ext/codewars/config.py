@@ -17,6 +17,7 @@ SECTION_EMOJI = {
 CONFIG: PlatformConfig = {
     "title": "CodeWars ✨",
     "sections_emoji": SECTION_EMOJI,
+    "base_url": "https://www.codewars.com",
 }
 
 add_config("codewars.config", CONFIG)
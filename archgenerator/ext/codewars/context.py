@@ -3,9 +3,11 @@ from contextvars import ContextVar
 CODEWARS_EMAIL: ContextVar[str] = ContextVar("CODEWARS_EMAIL")
 CODEWARS_PASSWORD: ContextVar[str] = ContextVar("CODEWARS_PASSWORD")
 CODEWARS_USERNAME: ContextVar[str] = ContextVar("CODEWARS_USERNAME")
+CODEWARS_FULL: ContextVar[bool] = ContextVar("CODEWARS_FULL", default=False)
 
 __all__ = [
     "CODEWARS_EMAIL",
+    "CODEWARS_FULL",
     "CODEWARS_PASSWORD",
     "CODEWARS_USERNAME",
 ]
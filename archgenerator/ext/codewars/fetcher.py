@@ -1,15 +1,19 @@
-from asyncio import gather
-from collections import defaultdict
+from asyncio import Task, create_task, gather
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
 from itertools import count
 from json import loads
-from typing import AsyncIterable, Any
+from sys import intern
+from typing import AsyncIterable, Any, Callable, cast
 
 from bs4 import Tag
-from httpx import AsyncClient
+from httpx import AsyncClient, Response, codes
 
 from .context import CODEWARS_USERNAME, CODEWARS_EMAIL, CODEWARS_PASSWORD
+from ...concurrency import max_concurrency
 from ...scrapper import Page, one, many
-from ...utils import cached
+from ...tracing import span
+from ...utils import cached, retry
 
 
 class LoginPage(Page):
@@ -27,25 +31,26 @@ class KataDescriptionPage(Page):
     )
 
 
+@dataclass(slots=True)
+class KataRecord:
+    name: str
+    link: str
+    href: str
+    section: str
+    description: str | None
+    solutions: dict[str, list[str]]
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+    def init_metadata(self) -> None:
+        self.metadata = {"description": self.href}
+
+
 class KataPage(Page):
     kuy: str = one(".is-extra-wide span,.tag span").text
     name: str = one("div + a[href]").text
     href: str = one("div + a[href]").attr("href")
 
     solutions: dict[str, list[str]]
-    description: str
-    metadata: dict[str, Any] = {}
-
-    @property
-    def section(self) -> str:
-        return self.kuy
-
-    @property
-    def link(self) -> str:
-        return f"https://www.codewars.com{self.href}"
-
-    def init_metadata(self) -> None:
-        self.metadata = {"description": self.href}
 
     def post_init(self, context: Tag) -> None:
         # TODO: should be better way to parse it
@@ -61,43 +66,118 @@ class KataPage(Page):
                 code = part.select_one("code").text
                 self.solutions[language].append(code)
 
+    def to_record(self) -> KataRecord:
+        return KataRecord(
+            name=self.name,
+            link=f"https://www.codewars.com{self.href}",
+            href=self.href,
+            section=intern(self.kuy),
+            description=None,
+            solutions=dict(self.solutions),
+        )
+
 
 class KatasPage(Page):
     katas: list[KataPage] = many(".list-item-solutions")
 
 
-async def katas_stream(client: AsyncClient, chunks: int = 50) -> AsyncIterable[Any]:
-    async def fetch(page_number: int = 0) -> KatasPage:
-        response = await client.get(
-            f"/users/{CODEWARS_USERNAME.get()}/completed_solutions",
-            params={"page": page_number},
-        )
-        return KatasPage(await response.aread())
+@retry
+async def katas_page(client: AsyncClient, page_number: int) -> list[KataRecord]:
+    response = await client.get(
+        f"/users/{CODEWARS_USERNAME.get()}/completed_solutions",
+        params={"page": page_number},
+    )
+    await response.aread()
+    response.raise_for_status()
+
+    return [kata.to_record() for kata in KatasPage(response.content).katas]
+
+
+async def katas_stream(
+    client: AsyncClient,
+    window: int | None = None,
+    is_known: Callable[[KataRecord], bool] | None = None,
+) -> AsyncIterable[KataRecord]:
+    window = 1 if is_known is not None else window or max_concurrency()
+
+    async def fetch(page_number: int = 0) -> list[KataRecord]:
+        with span("listing", page=page_number):
+            return await katas_page(client, page_number)
 
     counter = count()
     provided_katas = set()
+    pending: deque[Task[list[KataRecord]]] = deque()
+
+    try:
+        while True:
+            while len(pending) < window:
+                pending.append(create_task(fetch(next(counter))))
 
-    while True:
-        for page in await gather(*(fetch(next(counter)) for _ in range(chunks))):
-            if not page.katas:
+            if not (page := await pending.popleft()):
                 return
 
-            for solution in page.katas:
+            for solution in page:
                 if solution.href not in provided_katas:
                     provided_katas.add(solution.href)
                     yield solution
 
+            if is_known is not None and all(map(is_known, page)):
+                return
+    finally:
+        for task in pending:
+            task.cancel()
+
+        await gather(*pending, return_exceptions=True)
+
+
+@retry
+async def api_kata_response(client: AsyncClient, kata: KataRecord) -> Response:
+    *_, kata_id = kata.href.rstrip("/").split("/")
+
+    response = await client.get(f"/api/v1/code-challenges/{kata_id}")
+    await response.aread()
+
+    if response.status_code != codes.NOT_FOUND:
+        response.raise_for_status()
+
+    return response
 
-@cached
-async def get_kata_description(client: AsyncClient, kata: KataPage) -> str:
+
+async def api_kata_description(client: AsyncClient, kata: KataRecord) -> str | None:
+    response = await api_kata_response(client, kata)
+    if response.status_code == codes.NOT_FOUND:
+        return None
+
+    try:
+        return cast(str, response.json()["description"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+@retry
+async def html_kata_description(client: AsyncClient, kata: KataRecord) -> str:
     response = await client.get(kata.href)
-    kata_desc = KataDescriptionPage(await response.aread())
+    await response.aread()
+    response.raise_for_status()
+
+    kata_desc = KataDescriptionPage(response.content)
 
     return kata_desc.description
 
 
-async def kata_description(client: AsyncClient, kata: KataPage) -> None:
-    kata.description = await get_kata_description(client, kata)
+@cached(key=lambda client, kata: kata.href)
+async def get_kata_description(client: AsyncClient, kata: KataRecord) -> str:
+    if (description := await api_kata_description(client, kata)) is not None:
+        return description
+
+    return await html_kata_description(client, kata)
+
+
+async def kata_description(client: AsyncClient, kata: KataRecord) -> KataRecord:
+    with span("fetch_task", task=kata.name):
+        kata.description = await get_kata_description(client, kata)
+
+    return kata
 
 
 async def sign_in(client: AsyncClient) -> None:
@@ -126,6 +206,8 @@ async def sign_in(client: AsyncClient) -> None:
 
 
 __all__ = [
+    "KataRecord",
+    "KatasPage",
     "get_kata_description",
     "sign_in",
     "katas_stream",
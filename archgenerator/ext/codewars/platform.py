@@ -1,15 +1,19 @@
-from asyncio import gather
+from functools import partial
+from typing import Any, AsyncIterator
 
 import click
 from httpx import AsyncClient
-from more_itertools import chunked
 
 from .config import CONFIG
-from .context import CODEWARS_PASSWORD, CODEWARS_EMAIL
-from .fetcher import sign_in, katas_stream, kata_description, get_kata_description
-from ...consts import TASKS_CHUNK_SIZE
+from .context import CODEWARS_PASSWORD, CODEWARS_EMAIL, CODEWARS_FULL, CODEWARS_USERNAME
+from .fetcher import KataRecord, KatasPage, sign_in, katas_stream, kata_description, get_kata_description
+from ...docs.cache import content_hash
 from ...models import Book
+from ...client import create_client, poll_fingerprint
+from ...concurrency import max_concurrency
 from ...platform import Platform, TaskLike
+from ...tracing import span
+from ...utils import apipeline
 
 
 class CodeWarsPlatform(Platform):
@@ -26,31 +30,82 @@ class CodeWarsPlatform(Platform):
             click.option("--password", envvar="CODEWARS_PASSWORD", type=str),
             CODEWARS_PASSWORD,
         ),
+        "full": (
+            click.option("--full", envvar="CODEWARS_FULL", is_flag=True, default=False),
+            CODEWARS_FULL,
+        ),
     }
 
+    def __init__(self) -> None:
+        self._poll_state: dict[str, Any] = {}
+        self._known: dict[str, KataRecord] = {}
+
     def init_cache(self, book: Book) -> None:
         tasks = [task for section in book.sections for task in section.tasks]
 
-        descriptions_map: dict[str, str] = {
-            task.metadata["description"]: task.description for task in tasks if task.description
+        get_kata_description.cache.load(
+            (task.metadata["description"], task.description) for task in tasks if task.description
+        )
+
+        self._known = {
+            task.metadata["description"]: KataRecord(
+                name=task.name,
+                link=task.link,
+                href=task.metadata["description"],
+                section=section.name.split(" ", 1)[-1].lower(),
+                description=task.description,
+                solutions={language: [s.code for s in solutions] for language, solutions in task.solutions.items()},
+            )
+            for section in book.sections
+            for task in section.tasks
         }
 
-        get_kata_description.add_provider(lambda client, kata: descriptions_map[kata.href])
+    def is_known(self, kata: KataRecord) -> bool:
+        return (known := self._known.get(kata.href)) is not None and known.solutions == kata.solutions
 
-    async def fetch(self) -> list[TaskLike]:
-        async with AsyncClient(
-            base_url="https://www.codewars.com",
+    async def create_session(self) -> AsyncClient:
+        client = create_client(
+            base_url=self.config["base_url"],
             timeout=30,
             follow_redirects=True,
-        ) as client:
+        )
+
+        with span("sign_in"):
             await sign_in(client)
 
-            katas = [kata async for kata in katas_stream(client)]
+        return client
+
+    async def poll(self) -> str | None:
+        async with self.session() as client:
+            assert client is not None
+
+            return await poll_fingerprint(
+                client,
+                f"/users/{CODEWARS_USERNAME.get()}/completed_solutions",
+                self._poll_state,
+                lambda content: content_hash(*(kata.href for kata in KatasPage(content).katas)),
+                params={"page": 0},
+            )
+
+    async def fetch(self) -> AsyncIterator[TaskLike]:
+        async with self.session() as client:
+            assert client is not None
+
+            incremental = bool(self._known) and not CODEWARS_FULL.get()
+            provided = set()
 
-            for chunk in chunked(katas, TASKS_CHUNK_SIZE):
-                await gather(*(kata_description(client, kata) for kata in chunk))
+            async for kata in apipeline(
+                katas_stream(client, is_known=self.is_known if incremental else None),
+                partial(kata_description, client),
+                max_concurrency(),
+            ):
+                provided.add(kata.href)
+                yield kata
 
-            return katas
+            if incremental:
+                for href, known in self._known.items():
+                    if href not in provided:
+                        yield known
 
 
 __all__ = [
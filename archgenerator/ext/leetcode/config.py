@@ -13,6 +13,7 @@ SECTION_EMOJI = {
 CONFIG: PlatformConfig = {
     "title": "LeetCode 💫",
     "sections_emoji": SECTION_EMOJI,
+    "base_url": "https://leetcode.com",
 }
 
 add_config("leetcode.config", CONFIG)
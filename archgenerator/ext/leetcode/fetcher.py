@@ -1,6 +1,8 @@
+from asyncio import gather
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Sequence, cast, Any
+from json import loads
+from typing import Any, Collection, Mapping, Sequence, cast
 
 from httpx import AsyncClient
 from selene import browser
@@ -8,12 +10,17 @@ from selene.browser import driver
 from selene.support.conditions import be
 from selene.support.jquery_style_selectors import s
 
-from .config import LANG_TO_NORMALIZE_LANG, DIFFICULTY_LEVEL
+from .config import CONFIG, LANG_TO_NORMALIZE_LANG, DIFFICULTY_LEVEL
 from .context import LEETCODE_EMAIL, LEETCODE_PASSWORD, LEETCODE_SESSION
+from ...client import create_client
+from ...docs.cache import content_hash
 from ...scrapper import Page, one
+from ...tracing import span
 from ...utils import retry, cached, run_in_executor
 from ...web import with_chrome
 
+SUBMISSIONS_PAGE_SIZE = 20
+
 
 class SubmissionPage(Page):
     code: str = one("body").regex(
@@ -44,6 +51,9 @@ class Question:
     description: str | None = None
     solutions: dict[str, list[str]] = field(default_factory=lambda: defaultdict(list))
     metadata: dict[str, Any] = field(default_factory=dict)
+    known_submissions: dict[str, str] = field(default_factory=dict)
+    known_languages: Collection[str] = ()
+    refresh: bool = True
 
     @property
     def name(self) -> str:
@@ -69,16 +79,21 @@ class Question:
 
 
 @retry
-async def submissions_list(client: AsyncClient, slug: str) -> list[Submission]:
+async def submissions_page(
+    client: AsyncClient,
+    slug: str,
+    offset: int = 0,
+    last_key: str | None = None,
+) -> tuple[list[Submission], str | None, bool]:
     response = await client.request(
         "GET",
         "/graphql",
         json={
             "operationName": "Submissions",
             "variables": {
-                "offset": 0,
-                "limit": -1,
-                "lastKey": None,
+                "offset": offset,
+                "limit": SUBMISSIONS_PAGE_SIZE,
+                "lastKey": last_key,
                 "questionSlug": slug,
             },
             "query": """
@@ -101,7 +116,43 @@ async def submissions_list(client: AsyncClient, slug: str) -> list[Submission]:
     await response.aread()
     data = response.json()
 
-    return [Submission(**submission) for submission in data["data"]["submissionList"]["submissions"]]
+    submission_list = data["data"]["submissionList"]
+
+    return (
+        [Submission(**submission) for submission in submission_list["submissions"]],
+        submission_list["lastKey"],
+        submission_list["hasNext"],
+    )
+
+
+async def submissions_list(
+    client: AsyncClient,
+    slug: str,
+    known: Mapping[str, str] | None = None,
+    languages: Collection[str] = (),
+) -> list[Submission]:
+    known = known or {}
+    known_latest = max(map(int, known.values()), default=None)
+    expected = set() if known else {*languages}
+
+    submissions: list[Submission] = []
+    seen: set[str] = set()
+    last_key, has_next = None, True
+
+    while has_next:
+        page, last_key, has_next = await submissions_page(client, slug, len(submissions), last_key)
+
+        for submission in page:
+            if known_latest is not None and int(submission.id) <= known_latest:
+                return submissions + known_submissions_list(known, exclude=seen)
+
+            submissions.append(submission)
+            seen.add(submission.language)
+
+        if expected and expected <= seen:
+            break
+
+    return submissions
 
 
 @retry
@@ -122,7 +173,22 @@ async def questions_list(client: AsyncClient) -> list[Question]:
     ]
 
 
-@cached
+def solved_fingerprint(content: bytes) -> str:
+    data = loads(content)
+
+    return content_hash(
+        *map(
+            str,
+            sorted(
+                questions["stat"]["question_id"]
+                for questions in data["stat_status_pairs"]
+                if questions["status"] == "ac"
+            ),
+        )
+    )
+
+
+@cached(key=lambda client, submission: (submission.id, submission.language))
 @retry
 async def get_submission_code(client: AsyncClient, submission: Submission) -> str:
     response = await client.post(
@@ -147,7 +213,28 @@ async def get_submission_code(client: AsyncClient, submission: Submission) -> st
 
 @retry
 async def fetch_solutions(client: AsyncClient, question: Question) -> None:
-    question.submissions = await submissions_list(client, question.slug)
+    with span("fetch_solutions", task=question.title):
+        await _fetch_solutions(client, question)
+
+
+def known_submissions_list(known: Mapping[str, str], exclude: Collection[str] = ()) -> list[Submission]:
+    return [
+        Submission(id=submission_id, statusDisplay="Accepted", lang=language, url="")
+        for language, submission_id in known.items()
+        if language not in exclude
+    ]
+
+
+async def _fetch_solutions(client: AsyncClient, question: Question) -> None:
+    if question.refresh or not question.known_submissions:
+        question.submissions = await submissions_list(
+            client,
+            question.slug,
+            question.known_submissions,
+            question.known_languages,
+        )
+    else:
+        question.submissions = known_submissions_list(question.known_submissions)
 
     language_to_submission = {}
     for submission in question.submissions:
@@ -158,7 +245,7 @@ async def fetch_solutions(client: AsyncClient, question: Question) -> None:
         question.solutions[lang].append(await get_submission_code(client, submission))
 
 
-@cached
+@cached(key=lambda client, question: question.slug)
 @retry
 async def get_description(client: AsyncClient, question: Question) -> str:
     response = await client.request(
@@ -185,7 +272,13 @@ async def get_description(client: AsyncClient, question: Question) -> str:
 
 @retry
 async def fetch_descriptions(client: AsyncClient, question: Question) -> None:
-    question.description = await get_description(client, question)
+    with span("fetch_description", task=question.title):
+        question.description = await get_description(client, question)
+
+
+async def fetch_question(client: AsyncClient, question: Question) -> Question:
+    await gather(fetch_solutions(client, question), fetch_descriptions(client, question))
+    return question
 
 
 @run_in_executor
@@ -211,8 +304,8 @@ def browser_sign_in() -> str:
 
 async def sign_in() -> str:
     if leetcode_session := LEETCODE_SESSION.get():
-        async with AsyncClient(
-            base_url="https://leetcode.com",
+        async with create_client(
+            base_url=CONFIG["base_url"],
             cookies={"LEETCODE_SESSION": leetcode_session},
             follow_redirects=True,
         ) as client:
@@ -227,8 +320,11 @@ async def sign_in() -> str:
 __all__ = [
     "questions_list",
     "fetch_solutions",
+    "submissions_list",
     "fetch_descriptions",
+    "fetch_question",
     "get_description",
     "get_submission_code",
     "sign_in",
+    "solved_fingerprint",
 ]
@@ -1,23 +1,25 @@
-from asyncio.tasks import gather
-from typing import Any, cast
+from functools import partial
+from typing import Any, AsyncIterator, cast
 
 import click
 from httpx import AsyncClient
-from more_itertools import chunked
 
 from .config import CONFIG, DIFFICULTY_LEVEL
 from .context import LEETCODE_EMAIL, LEETCODE_PASSWORD, LEETCODE_SESSION
 from .fetcher import (
     sign_in,
+    solved_fingerprint,
     questions_list,
-    fetch_solutions,
-    fetch_descriptions,
+    fetch_question,
     get_description,
     get_submission_code,
 )
-from ...consts import TASKS_CHUNK_SIZE
 from ...models import Book
+from ...client import create_client, poll_fingerprint
+from ...concurrency import max_concurrency
 from ...platform import Platform, TaskLike
+from ...tracing import span
+from ...utils import apipeline
 
 
 class LeetCodePlatform(Platform):
@@ -40,43 +42,70 @@ class LeetCodePlatform(Platform):
         ),
     }
 
+    def __init__(self) -> None:
+        self._poll_state: dict[str, Any] = {}
+        self._known_submissions: dict[str, dict[str, str]] = {}
+        self._known_languages: set[str] = set()
+        self._delta = False
+
     def init_cache(self, book: Book) -> None:
         tasks = [task for section in book.sections for task in section.tasks]
 
-        descriptions_map: dict[str, str] = {
-            task.metadata["slug"]: task.description for task in tasks if task.description
-        }
-
-        get_description.add_provider(lambda client, question: descriptions_map[question.slug])
+        get_description.cache.load((task.metadata["slug"], task.description) for task in tasks if task.description)
+        self._known_submissions = {task.metadata["slug"]: task.metadata["submissions"] for task in tasks}
+        self._known_languages = {language for task in tasks for language in task.solutions}
 
-        submissions_map = {
-            (submission_id, language): task.solutions[language][0].code
+        get_submission_code.cache.load(
+            ((submission_id, language), task.solutions[language][0].code)
             for task in tasks
             for language, submission_id in task.metadata["submissions"].items()
-        }
-
-        get_submission_code.add_provider(
-            lambda client, submission: submissions_map[(submission.id, submission.language)]
         )
 
     def section_sorter_key(self, name: str) -> Any:
         return DIFFICULTY_LEVEL.index(name)
 
-    async def fetch(self) -> list[TaskLike]:
-        leetcode_session = await sign_in()
+    async def create_session(self) -> AsyncClient:
+        with span("sign_in"):
+            leetcode_session = await sign_in()
 
-        async with AsyncClient(
-            base_url="https://leetcode.com",
+        return create_client(
+            base_url=self.config["base_url"],
             cookies={"LEETCODE_SESSION": leetcode_session},
             follow_redirects=True,
-        ) as client:
-            questions = await questions_list(client)
+        )
+
+    async def poll(self) -> str | None:
+        async with self.session() as client:
+            assert client is not None
+
+            return await poll_fingerprint(
+                client,
+                "/api/problems/all",
+                self._poll_state,
+                self._poll_digest,
+                params={"status": "Solved"},
+            )
+
+    def _poll_digest(self, content: bytes) -> str:
+        self._delta = "fingerprint" in self._poll_state
+        return solved_fingerprint(content)
+
+    async def fetch(self) -> AsyncIterator[TaskLike]:
+        async with self.session() as client:
+            assert client is not None
+
+            with span("listing"):
+                questions = await questions_list(client)
+
+            delta, self._delta = self._delta, False
 
-            for chunk in chunked(questions, TASKS_CHUNK_SIZE):
-                await gather(*(fetch_solutions(client, question) for question in chunk))
-                await gather(*(fetch_descriptions(client, question) for question in chunk))
+            for question in questions:
+                question.known_submissions = self._known_submissions.get(question.slug, {})
+                question.known_languages = self._known_languages
+                question.refresh = not delta
 
-            return cast(list[TaskLike], questions)
+            async for question in apipeline(questions, partial(fetch_question, client), max_concurrency()):
+                yield cast(TaskLike, question)
 
 
 __all__ = [
@@ -1,20 +1,30 @@
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from contextvars import ContextVar
+from functools import wraps
 from typing import (
     Protocol,
     runtime_checkable,
     Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Iterable,
     Mapping,
     Callable,
     ClassVar,
     TypedDict,
+    NotRequired,
     TypeVar,
     ParamSpec,
     cast,
 )
 
+import click
+from httpx import AsyncClient
 from pkg_resources import iter_entry_points
 
+from .events import CURRENT_PLATFORM, EventType, emit, stage
 from .models import Book, Solution, Section, Task
 
 ClickOptionWrapper = Callable[..., Any]
@@ -34,9 +44,29 @@ class TaskLike(Protocol):
         pass
 
 
+def _prefixed_option(option: ClickOptionWrapper, name: str) -> ClickOptionWrapper:
+    (param,) = option(lambda: None).__click_params__
+
+    return click.option(
+        f"--{name.replace('_', '-')}",
+        name,
+        envvar=param.envvar,
+        type=param.type,
+        default=param.default,
+        is_flag=param.is_flag,
+        multiple=param.multiple,
+        required=param.required,
+        help=param.help,
+        show_envvar=param.show_envvar,
+        show_default=param.show_default,
+        hidden=param.hidden,
+    )
+
+
 class PlatformConfig(TypedDict):
     title: str
     sections_emoji: Mapping[str, str]
+    base_url: NotRequired[str]
 
 
 T = TypeVar("T")
@@ -50,12 +80,47 @@ class Platform(ABC):
     options: ClassVar[Mapping[str, tuple[ClickOptionWrapper, ContextVar[Any]]]] = {}
 
     @abstractmethod
-    async def fetch(self) -> list[TaskLike]:
+    def fetch(self) -> Awaitable[Iterable[TaskLike]] | AsyncIterable[TaskLike]:
         pass
 
+    async def iter_tasks(self) -> AsyncIterator[TaskLike]:
+        tasks = self.fetch()
+
+        if isinstance(tasks, AsyncIterable):
+            async for task in tasks:
+                yield task
+        else:
+            for task in await tasks:
+                yield task
+
+    client: AsyncClient | None = None
+
+    async def create_session(self) -> AsyncClient | None:
+        return None
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncClient | None]:
+        if self.client is not None or (client := await self.create_session()) is None:
+            yield self.client
+            return
+
+        self.client = client
+
+        try:
+            yield client
+        finally:
+            self.client = None
+            await client.aclose()
+
+    async def poll(self) -> str | None:
+        return None
+
     def init_cache(self, book: Book) -> None:
         pass
 
+    def emit(self, type: EventType, **data: Any) -> None:
+        emit(type, self.name, **data)
+
     def book_name(self) -> str:
         return self.config["title"]
 
@@ -65,45 +130,66 @@ class Platform(ABC):
     def section_sorter_key(self, name: str) -> Any:
         return name
 
-    def wrap_cli(self, cli: Callable[P, T]) -> Callable[P, T]:
+    def wrap_cli(self, cli: Callable[P, T], prefix: str | None = None) -> Callable[P, T]:
+        names = {name: f"{prefix}_{name}" if prefix else name for name in self.options}
+
+        @wraps(cli)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
             for name, (_, var) in self.options.items():
-                var.set(kwargs[name])
+                var.set(kwargs[names[name]])
 
             return cli(*args, **kwargs)
 
-        for option, _ in self.options.values():
-            wrapper = option(wrapper)
+        for name, (option, _) in self.options.items():
+            wrapper = (option if prefix is None else _prefixed_option(option, names[name]))(wrapper)
 
         return cast(Callable[P, T], wrapper)
 
-    async def generate_book(self, old_book: Book | None = None) -> Book:
+    def convert_task(self, task: TaskLike) -> Task:
+        task.init_metadata()
+
+        return Task(
+            name=task.name,
+            link=task.link,
+            description=task.description,
+            solutions={
+                language: [Solution(language=language, code=solution) for solution in solutions]
+                for language, solutions in task.solutions.items()
+            },
+            metadata=task.metadata,
+        )
+
+    async def generate_book(
+        self,
+        old_book: Book | None = None,
+        on_task: Callable[[Task], Any] | None = None,
+    ) -> Book:
+        token = CURRENT_PLATFORM.set(self.name)
+
+        try:
+            with stage("fetch"):
+                return await self._generate_book(old_book, on_task)
+        finally:
+            CURRENT_PLATFORM.reset(token)
+
+    async def _generate_book(self, old_book: Book | None, on_task: Callable[[Task], Any] | None) -> Book:
         if old_book is not None and self.init_cache is not None:
             self.init_cache(old_book)
 
-        tasks = await self.fetch()
-
         book = Book(name=self.book_name(), sections=[])
 
         sections = {}
-        for t in tasks:
+        async for t in self.iter_tasks():
             if t.section not in sections:
                 sections[t.section] = Section(name=self.section_name(t), tasks=[])
 
-            t.init_metadata()
-
-            sections[t.section].tasks.append(
-                Task(
-                    name=t.name,
-                    link=t.link,
-                    description=t.description,
-                    solutions={
-                        language: [Solution(language=language, code=solution) for solution in solutions]
-                        for language, solutions in t.solutions.items()
-                    },
-                    metadata=t.metadata,
-                )
-            )
+            task = self.convert_task(t)
+            sections[t.section].tasks.append(task)
+
+            self.emit(EventType.TASK_FETCHED, name=task.name, section=t.section)
+
+            if on_task is not None:
+                on_task(task)
 
         for section_name in sorted(sections, reverse=self.section_reversed, key=self.section_sorter_key):
             section = sections[section_name]
@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING, TypeVar, get_type_hints
 
 from bs4 import BeautifulSoup, Tag
+from ..tracing import span
 
 if TYPE_CHECKING:
     from .elements import DeclarativeElement
@@ -20,12 +21,17 @@ class Page:
     __elements__: dict[str, _PageElement]
 
     def __init__(self, source: str | bytes | Tag) -> None:
-        context = source if isinstance(source, Tag) else BeautifulSoup(source, features="html.parser")
+        with span(f"parse {type(self).__name__}", "parse"):
+            context = source if isinstance(source, Tag) else BeautifulSoup(source, features="html.parser")
 
-        for name, page_element in self.__elements__.items():
-            setattr(self, name, page_element.element.resolve(context, page_element.type))
+            try:
+                for name, page_element in self.__elements__.items():
+                    setattr(self, name, page_element.element.resolve(context, page_element.type))
 
-        self.post_init(context)
+                self.post_init(context)
+            finally:
+                if context is not source:
+                    context.decompose()
 
     def __repr__(self) -> str:
         attrs = {attr: getattr(self, attr) for attr in self.__elements__}
@@ -0,0 +1,118 @@
+from collections import Counter, defaultdict
+from json import dumps
+from pathlib import Path
+from time import monotonic
+from typing import IO
+
+import click
+
+from .events import Event, EventType
+
+
+class ProgressSubscriber:
+    def __init__(self, interval: float = 0.1) -> None:
+        self.interval = interval
+        self.tasks: Counter[str] = Counter()
+        self.requests = 0
+        self.bytes = 0
+        self.last_render = 0.0
+
+    def __call__(self, event: Event) -> None:
+        if event.type == EventType.TASK_FETCHED:
+            self.tasks[event.platform or "-"] += 1
+        elif event.type == EventType.REQUEST_END:
+            self.requests += 1
+            self.bytes += event.data["bytes"]
+        elif event.type != EventType.STAGE_END:
+            return
+
+        if (now := monotonic()) - self.last_render >= self.interval or event.type == EventType.STAGE_END:
+            self.last_render = now
+            self.render()
+
+    def render(self) -> None:
+        tasks = ", ".join(f"{platform}: {count}" for platform, count in sorted(self.tasks.items()))
+        click.echo(
+            f"\rTasks [{tasks}] | {self.requests} requests | {self.bytes / 1024 / 1024:.1f} MiB",
+            nl=False,
+            err=True,
+        )
+
+    def close(self) -> None:
+        self.render()
+        click.echo(err=True)
+
+
+class JsonLinesSubscriber:
+    def __init__(self, path: Path) -> None:
+        self.file: IO[str] = path.open("a", encoding="utf-8")
+
+    def __call__(self, event: Event) -> None:
+        self.file.write(
+            dumps({"event": str(event.type), "time": event.time, "platform": event.platform, **event.data}) + "\n"
+        )
+
+    def close(self) -> None:
+        self.file.close()
+
+
+Labels = tuple[tuple[str, str], ...]
+
+GAUGES = {"cache_hit_ratio", "stage_seconds"}
+
+
+class PrometheusSubscriber:
+    def __init__(self, path: Path, prefix: str = "archgenerator") -> None:
+        self.path = path
+        self.prefix = prefix
+        self.metrics: dict[str, dict[Labels, float]] = defaultdict(lambda: defaultdict(float))
+
+    def inc(self, name: str, value: float = 1, **labels: str | None) -> None:
+        key = tuple(sorted((label, value) for label, value in labels.items() if value is not None))
+        self.metrics[name][key] += value
+
+    def __call__(self, event: Event) -> None:
+        platform, data = event.platform, event.data
+
+        if event.type == EventType.REQUEST_END:
+            self.inc("requests_total", platform=platform, status=str(data["status"] or "error"))
+            self.inc("request_seconds_total", data["seconds"], platform=platform)
+            self.inc("response_bytes_total", data["bytes"], platform=platform)
+        elif event.type in (EventType.CACHE_HIT, EventType.CACHE_MISS):
+            name = "cache_hits_total" if event.type == EventType.CACHE_HIT else "cache_misses_total"
+            self.inc(name, platform=platform, function=data["function"])
+        elif event.type == EventType.CACHE_STATS:
+            self.inc("cache_coalesced_total", data["coalesced"], function=data["function"])
+            self.inc("cache_evictions_total", data["evictions"], function=data["function"])
+            self.inc("cache_load_seconds_total", data["load_seconds"], function=data["function"])
+            self.metrics["cache_hit_ratio"][(("function", data["function"]),)] = data["hit_ratio"]
+        elif event.type == EventType.RETRY:
+            self.inc("retries_total", platform=platform, function=data["function"])
+        elif event.type == EventType.TASK_FETCHED:
+            self.inc("tasks_fetched_total", platform=platform)
+        elif event.type == EventType.STAGE_END:
+            self.inc("stage_seconds", data["seconds"], platform=platform, stage=data["stage"])
+
+    def render(self) -> str:
+        lines = []
+        for name, series in sorted(self.metrics.items()):
+            metric = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {metric} {'gauge' if name in GAUGES else 'counter'}")
+
+            for labels, value in sorted(series.items()):
+                rendered = ",".join(f'{label}="{value}"' for label, value in labels)
+                lines.append(f"{metric}{{{rendered}}} {value:g}" if rendered else f"{metric} {value:g}")
+
+        return "\n".join(lines) + "\n"
+
+    def close(self) -> None:
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        tmp.write_text(self.render(), encoding="utf-8")
+        tmp.replace(self.path)
+
+
+__all__ = [
+    "JsonLinesSubscriber",
+    "ProgressSubscriber",
+    "PrometheusSubscriber",
+]
@@ -0,0 +1,60 @@
+from asyncio import gather
+from pathlib import Path
+from typing import Iterable
+
+from .docs.commit import commit_docs
+from .docs.generator import generate_docs
+from .docs.journal import record_written
+from .models import Book
+from .platform import PLATFORMS, Platform
+from .serializer import dump, load
+from .tracing import span
+
+NON_BOOK_FILES = {"book.json", "config.json"}
+
+
+def book_path(root: Path, platform: Platform) -> Path:
+    return root / f"{platform.name}.json"
+
+
+def load_books(root: Path, exclude: Iterable[Path] = ()) -> list[Book]:
+    excluded = {*exclude}
+    return [load(Book, p) for p in root.glob("*.json") if p.name not in NON_BOOK_FILES and p not in excluded]
+
+
+async def generate_books(root: Path, platforms: Iterable[Platform] | None = None) -> list[Book]:
+    platforms = [*(PLATFORMS.values() if platforms is None else platforms)]
+    paths = [book_path(root, platform) for platform in platforms]
+
+    books = await gather(
+        *(
+            platform.generate_book(load(Book, path) if path.exists() else None)
+            for platform, path in zip(platforms, paths)
+        )
+    )
+
+    for book, path in zip(books, paths):
+        with span("dump", book=book.name):
+            dump(book, path)
+
+    record_written(root, [path.name for path in paths])
+
+    return [*books, *load_books(root, exclude=paths)]
+
+
+def publish(
+    root: Path,
+    books: list[Book],
+    push_commit: bool = False,
+    workers: int | None = None,
+) -> None:
+    generate_docs(sorted(books, key=lambda book: book.name), root, workers)
+    commit_docs(root, push_commit)
+
+
+__all__ = [
+    "book_path",
+    "generate_books",
+    "load_books",
+    "publish",
+]
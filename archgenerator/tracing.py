@@ -0,0 +1,90 @@
+import os
+from asyncio import current_task
+from contextlib import contextmanager
+from contextvars import ContextVar
+from json import dumps
+from pathlib import Path
+from threading import get_ident
+from time import perf_counter
+from typing import Any, Iterator
+
+from .events import CURRENT_PLATFORM, Event, EventType
+
+
+class Tracer:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.origin = perf_counter()
+        self.spans: list[dict[str, Any]] = []
+        self._tids: dict[int, int] = {}
+
+    def _tid(self) -> int:
+        try:
+            task = current_task()
+        except RuntimeError:
+            task = None
+
+        return self._tids.setdefault(get_ident() if task is None else id(task), len(self._tids) + 1)
+
+    def add(self, name: str, category: str, start: float, end: float, **args: Any) -> None:
+        if (platform := CURRENT_PLATFORM.get()) is not None:
+            args.setdefault("platform", platform)
+
+        self.spans.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self.origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": os.getpid(),
+                "tid": self._tid(),
+                "args": args,
+            }
+        )
+
+    def __call__(self, event: Event) -> None:
+        if event.type not in (EventType.REQUEST_END, EventType.STAGE_END):
+            return
+
+        end = perf_counter()
+        start = end - event.data["seconds"]
+
+        if event.type == EventType.STAGE_END:
+            self.add(event.data["stage"], "stage", start, end)
+        else:
+            self.add(
+                f"{event.data['method']} {event.data['url']}",
+                "http",
+                start,
+                end,
+                status=event.data["status"],
+                bytes=event.data["bytes"],
+                **({"error": event.data["error"]} if "error" in event.data else {}),
+            )
+
+    def close(self) -> None:
+        self.path.write_text(dumps({"traceEvents": self.spans, "displayTimeUnit": "ms"}), encoding="utf-8")
+
+
+TRACER: ContextVar[Tracer | None] = ContextVar("TRACER", default=None)
+
+
+@contextmanager
+def span(name: str, category: str = "function", **args: Any) -> Iterator[None]:
+    if (tracer := TRACER.get()) is None:
+        yield
+        return
+
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        tracer.add(name, category, start, perf_counter(), **args)
+
+
+__all__ = [
+    "TRACER",
+    "Tracer",
+    "span",
+]
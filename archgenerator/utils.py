@@ -1,11 +1,32 @@
-from asyncio import sleep, to_thread
+from asyncio import FIRST_COMPLETED, Queue, create_task, gather, sleep, to_thread, wait
 from functools import wraps
 from itertools import count
 from random import randint
-from typing import Callable, TypeVar, Awaitable, Protocol, ParamSpec, cast, overload, Any, no_type_check
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Hashable,
+    Iterable,
+    ParamSpec,
+    Protocol,
+    TypeVar,
+    no_type_check,
+    overload,
+)
+
+from httpx import AsyncBaseTransport, AsyncClient
+
+from .cache import Cache, get_cache
+from .events import EventType, emit
 
 P = ParamSpec("P")
 T = TypeVar("T")
+R = TypeVar("R")
+
+_DONE = object()
 
 
 @overload
@@ -42,10 +63,11 @@ def retry(
             for i in count(1):
                 try:
                     return await func(*args, **kwargs)
-                except Exception:
+                except Exception as exc:
                     if i == attempts:
                         raise
 
+                    emit(EventType.RETRY, function=func.__name__, attempt=i, error=repr(exc))
                     await sleep(randint(*delay_range))
 
         return wrapper
@@ -54,28 +76,118 @@ def retry(
 
 
 class CachedFunction(Protocol[P, T]):
+    cache: Cache[Any, T]
+
     async def __call__(self, *args: P.args, **kwargs: P.kwargs) -> T:
         pass
 
-    def add_provider(self, provider: Callable[P, T]) -> None:
-        pass
+
+TRANSPORT_TYPES = (AsyncClient, AsyncBaseTransport)
+
+
+def _default_key(*args: Any, **kwargs: Any) -> Hashable:
+    return (
+        tuple(arg for arg in args if not isinstance(arg, TRANSPORT_TYPES)),
+        tuple(sorted((name, value) for name, value in kwargs.items() if not isinstance(value, TRANSPORT_TYPES))),
+    )
 
 
+@overload
 def cached(func: Callable[P, Awaitable[T]]) -> CachedFunction[P, T]:
-    providers: list[Callable[P, T]] = []
+    pass
 
-    @wraps(func)
-    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-        for provider in providers:
-            try:
-                return provider(*args, **kwargs)
-            except LookupError:
-                pass
 
-        return await func(*args, **kwargs)
+@overload
+def cached(
+    *,
+    key: Callable[P, Hashable] | None = ...,
+    maxsize: int | None = ...,
+) -> Callable[[Callable[P, Awaitable[T]]], CachedFunction[P, T]]:
+    pass
+
+
+@no_type_check
+def cached(
+    func: Any | None = None,
+    /,
+    *,
+    key: Any | None = None,
+    maxsize: int | None = 1024,
+) -> Any:
+    if func is not None:
+        return cached(key=key, maxsize=maxsize)(func)
+
+    make_key = key or _default_key
+
+    def decorator(func):
+        cache = get_cache(f"{func.__module__}.{func.__qualname__}", maxsize, persist=key is not None)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await cache.get_or_load(make_key(*args, **kwargs), lambda: func(*args, **kwargs))
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+async def apipeline(
+    iterable: AsyncIterable[T] | Iterable[T],
+    func: Callable[[T], Awaitable[R]],
+    workers: int,
+    maxsize: int | None = None,
+) -> AsyncIterator[R]:
+    inbox: Queue[Any] = Queue(maxsize or workers)
+    outbox: Queue[R] = Queue(maxsize or workers)
+
+    async def produce() -> None:
+        if isinstance(iterable, AsyncIterable):
+            async for item in iterable:
+                await inbox.put(item)
+        else:
+            for item in iterable:
+                await inbox.put(item)
+
+        for _ in range(workers):
+            await inbox.put(_DONE)
+
+    async def work() -> None:
+        while (item := await inbox.get()) is not _DONE:
+            await outbox.put(await func(item))
+
+    async def run() -> None:
+        tasks = [create_task(produce()), *(create_task(work()) for _ in range(workers))]
+
+        try:
+            await gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    runner = create_task(run())
+    getter = None
+
+    try:
+        while True:
+            getter = create_task(outbox.get())
+            await wait({getter, runner}, return_when=FIRST_COMPLETED)
+
+            if not getter.done():
+                break
+
+            yield getter.result()
+
+        runner.result()
+
+        while not outbox.empty():
+            yield outbox.get_nowait()
+    finally:
+        for task in (getter, runner):
+            if task is not None and not task.done():
+                task.cancel()
 
-    wrapper.add_provider = providers.append  # type: ignore[attr-defined]
-    return cast(CachedFunction[P, T], wrapper)
+        await gather(runner, return_exceptions=True)
 
 
 def run_in_executor(func: Callable[P, T]) -> Callable[P, Awaitable[T]]:
@@ -87,6 +199,7 @@ def run_in_executor(func: Callable[P, T]) -> Callable[P, Awaitable[T]]:
 
 
 __all__ = [
+    "apipeline",
     "cached",
     "retry",
     "run_in_executor",
@@ -0,0 +1,107 @@
+from asyncio import gather, sleep, to_thread
+from contextlib import AsyncExitStack
+from pathlib import Path
+
+import click
+
+from .docs.journal import record_written
+from .events import stage
+from .models import Book
+from .platform import PLATFORMS, Platform
+from .serializer import dump, load
+from .sync import book_path, load_books, publish
+from .tracing import span
+
+
+class Watcher:
+    def __init__(
+        self,
+        root: Path,
+        platforms: list[Platform] | None = None,
+        push_commit: bool = False,
+        workers: int | None = None,
+    ) -> None:
+        self.root = root
+        self.platforms = [*PLATFORMS.values()] if platforms is None else platforms
+        self.push_commit = push_commit
+        self.workers = workers
+
+        self.paths = {platform.name: book_path(root, platform) for platform in self.platforms}
+        self.books = {name: load(Book, path) for name, path in self.paths.items() if path.exists()}
+        self.extra_books = load_books(root, exclude=self.paths.values())
+        self.fingerprints: dict[str, str | None] = {}
+
+    async def changed_platforms(self) -> list[Platform]:
+        with stage("poll"):
+            fingerprints = await gather(*(platform.poll() for platform in self.platforms))
+
+        changed = [
+            platform
+            for platform, fingerprint in zip(self.platforms, fingerprints)
+            if fingerprint is None or self.fingerprints.get(platform.name) != fingerprint
+        ]
+        self.fingerprints.update(
+            (platform.name, fingerprint) for platform, fingerprint in zip(self.platforms, fingerprints)
+        )
+
+        return changed
+
+    async def sync(self) -> list[str]:
+        if not (changed := await self.changed_platforms()):
+            return []
+
+        books = await gather(*(platform.generate_book(self.books.get(platform.name)) for platform in changed))
+
+        updated = []
+        for platform, book in zip(changed, books):
+            if self.books.get(platform.name) == book:
+                continue
+
+            self.books[platform.name] = book
+            updated.append(book.name)
+
+            with span("dump", book=book.name):
+                dump(book, self.paths[platform.name])
+
+            record_written(self.root, [self.paths[platform.name].name])
+
+        if updated:
+            await to_thread(
+                publish,
+                self.root,
+                [*self.books.values(), *self.extra_books],
+                self.push_commit,
+                self.workers,
+            )
+
+        return updated
+
+    async def run(self, interval: float, iterations: int | None = None) -> None:
+        remaining = iterations
+
+        while remaining is None or remaining > 0:
+            try:
+                async with AsyncExitStack() as stack:
+                    for platform in self.platforms:
+                        await stack.enter_async_context(platform.session())
+
+                    while remaining is None or remaining > 0:
+                        if remaining is not None:
+                            remaining -= 1
+
+                        if updated := await self.sync():
+                            click.echo(f"Synced {', '.join(updated)}", err=True)
+
+                        if remaining != 0:
+                            await sleep(interval)
+            except Exception as exc:
+                self.fingerprints.clear()
+                click.echo(f"Watch iteration failed, reopening sessions: {exc!r}", err=True)
+
+                if remaining != 0:
+                    await sleep(interval)
+
+
+__all__ = [
+    "Watcher",
+]
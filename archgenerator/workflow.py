@@ -26,22 +26,22 @@ jobs:
           python -m pip install --upgrade pip
           python -m pip install git+https://github.com/uriyyo/archgenerator.git
 
-      - name: Update solutions
+      - name: Restore docs caches
+        uses: actions/cache@v4
+        with:
+          path: |
+            .archgenerator
+            !.archgenerator/manifest.json
+          key: archgenerator-${{ hashFiles('config.json') }}-${{ github.run_id }}
+          restore-keys: |
+            archgenerator-${{ hashFiles('config.json') }}-
+
+      - name: Sync solutions and docs
         env:
           CODEWARS_EMAIL: ${{ secrets.CODEWARS_EMAIL }}
           CODEWARS_PASSWORD: ${{ secrets.CODEWARS_PASSWORD }}
           LEETCODE_EMAIL: ${{ secrets.LEETCODE_EMAIL }}
           LEETCODE_PASSWORD: ${{ secrets.LEETCODE_PASSWORD }}
-        run: |
-          archgenerator codewars
-          archgenerator leetcode
-
-      - name: Generate docs
-        run: |
-          archgenerator docs
-
-      - name: Commit and push changes
-        env:
           USER_NAME: ${{ secrets.USER_NAME }}
           USER_EMAIL: ${{ secrets.USER_EMAIL }}
         run: |
@@ -49,7 +49,7 @@ jobs:
           git config core.whitespace cr-at-eol
           git config user.name ${USER_NAME}
           git config user.email ${USER_EMAIL}
-          archgenerator commit --push
+          archgenerator sync --push
 """
 
 
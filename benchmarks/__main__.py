@@ -0,0 +1,64 @@
+from functools import partial
+from pathlib import Path
+
+import click
+
+from .run import load_baseline, measure_passes, regressions, run, run_crawl, run_replay, save
+
+
+@click.command()
+@click.option("-t", "--tasks", type=int, multiple=True, default=(100, 1_000, 10_000))
+@click.option("-w", "--workers", type=int, default=1)
+@click.option("-b", "--baseline", type=click.Path(dir_okay=False), default="benchmarks/baseline.json")
+@click.option("--tolerance", type=float, default=0.25)
+@click.option("--save", "save_baseline", type=bool, is_flag=True, default=False)
+@click.option("--cassette", type=click.Path(exists=True, dir_okay=False), default=None)
+@click.option("-p", "--platform", "platforms", type=str, multiple=True, default=())
+@click.option("--latency", type=float, default=0.0)
+@click.option("--crawl-pages", type=int, default=None)
+def main(
+    tasks: tuple[int, ...],
+    workers: int,
+    baseline: str,
+    tolerance: float,
+    save_baseline: bool,
+    cassette: str | None,
+    platforms: tuple[str, ...],
+    latency: float,
+    crawl_pages: int | None,
+) -> None:
+    results = run([*tasks], workers) if crawl_pages is None else {}
+
+    if cassette is not None:
+        results["replay"] = measure_passes(partial(run_replay, Path(cassette), [*platforms], latency))
+
+    if crawl_pages is not None:
+        results["crawl"] = run_crawl(crawl_pages)
+
+    for scale, stages in results.items():
+        for stage, measurement in stages.items():
+            click.echo(
+                f"{scale:>7} tasks  {stage:<32} {measurement.seconds:10.3f}s "
+                f"{measurement.peak_memory / 2**20:10.1f} MiB"
+            )
+
+    if crawl_pages is not None:
+        first, *_, last = [*results["crawl"].values()]
+
+        if last.peak_memory > first.peak_memory * (1 + tolerance):
+            raise click.ClickException(
+                f"RSS grew while crawling: {first.peak_memory / 2**20:.1f} MiB -> {last.peak_memory / 2**20:.1f} MiB"
+            )
+
+    baseline_path = Path(baseline)
+
+    if save_baseline:
+        save(results, baseline_path)
+    elif not baseline_path.exists():
+        raise click.ClickException(f"Baseline {baseline_path} does not exist, run with --save to record it")
+    elif found := regressions(results, load_baseline(baseline_path), tolerance):
+        raise click.ClickException("Performance regressions:\n" + "\n".join(found))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+from dataclasses import dataclass, field
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps, loads
+from random import Random
+from threading import Lock, Thread
+from time import sleep
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import click
+
+from .synthetic import LANGUAGES, _text
+
+USERNAME = "fake-user"
+AUTH_TOKEN = "fake-token"
+
+KYUS = ("8 kyu", "7 kyu", "6 kyu", "5 kyu", "4 kyu", "3 kyu", "2 kyu", "1 kyu", "beta", "retired")
+LEETCODE_LANGS = {"python": "python3", "javascript": "javascript", "java": "java", "c++": "cpp", "rust": "rust"}
+
+
+@dataclass
+class FakeSubmission:
+    id: str
+    lang: str
+    code: str
+
+
+@dataclass
+class FakeQuestion:
+    id: int
+    slug: str
+    title: str
+    level: int
+    content: str
+    submissions: list[FakeSubmission]
+
+
+@dataclass
+class FakeKata:
+    id: str
+    name: str
+    kyu: str
+    description: str
+    solutions: dict[str, list[str]]
+
+
+@dataclass
+class FaultConfig:
+    latency: float = 0.0
+    jitter: float = 0.0
+    rate_limit: float = 0.0
+    server_error: float = 0.0
+    seed: int = 0
+
+
+@dataclass
+class FakeData:
+    questions: list[FakeQuestion] = field(default_factory=list)
+    katas: list[FakeKata] = field(default_factory=list)
+
+    @property
+    def questions_by_slug(self) -> dict[str, FakeQuestion]:
+        return {question.slug: question for question in self.questions}
+
+
+def make_data(leetcode_tasks: int, codewars_tasks: int, seed: int = 0, submissions: int = 3) -> FakeData:
+    rnd = Random(seed)
+    data = FakeData()
+
+    submission_ids = iter(range(1_000_000, 10**9))
+    for i in range(leetcode_tasks):
+        langs = rnd.sample([*LEETCODE_LANGS.values()], k=rnd.randint(1, 3))
+        data.questions.append(
+            FakeQuestion(
+                id=i + 1,
+                slug=f"question-{i + 1}",
+                title=f"{_text(rnd, 3).title()} {i + 1}",
+                level=rnd.randint(1, 3),
+                content=f"<p>{_text(rnd, 200)}</p>",
+                submissions=[
+                    FakeSubmission(
+                        id=str(next(submission_ids)),
+                        lang=rnd.choice(langs),
+                        code="\n".join(_text(rnd, 6) for _ in range(20)),
+                    )
+                    for _ in range(rnd.randint(1, submissions))
+                ],
+            )
+        )
+
+    for i in range(codewars_tasks):
+        data.katas.append(
+            FakeKata(
+                id=f"{i + 1:024x}",
+                name=f"{_text(rnd, 3).title()} {i + 1}",
+                kyu=rnd.choice(KYUS),
+                description=f"{_text(rnd, 200)} (see {i + 1})",
+                solutions={
+                    lang: ["\n".join(_text(rnd, 6) for _ in range(20))]
+                    for lang in rnd.sample(LANGUAGES, k=rnd.randint(1, 2))
+                },
+            )
+        )
+
+    return data
+
+
+class FakePlatformServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        data: FakeData,
+        faults: FaultConfig | None = None,
+        page_size: int = 15,
+        codewars_api: bool = True,
+    ) -> None:
+        super().__init__(address, FakePlatformHandler)
+
+        self.data = data
+        self.questions = data.questions_by_slug
+        self.submissions = {s.id: s for q in data.questions for s in q.submissions}
+        self.katas = {kata.id: kata for kata in data.katas}
+        self.faults = faults or FaultConfig()
+        self.page_size = page_size
+        self.codewars_api = codewars_api
+
+        self.random = Random(self.faults.seed)
+        self.lock = Lock()
+        self.requests = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def fault(self) -> tuple[float, int | None]:
+        with self.lock:
+            self.requests += 1
+            delay = self.faults.latency + self.random.uniform(0, self.faults.jitter)
+            roll = self.random.random()
+
+        if roll < self.faults.rate_limit:
+            return delay, 429
+        if roll < self.faults.rate_limit + self.faults.server_error:
+            return delay, 503
+
+        return delay, None
+
+
+class FakePlatformHandler(BaseHTTPRequestHandler):
+    server: FakePlatformServer
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *_: Any) -> None:
+        pass
+
+    def send(self, status: int, body: str | bytes, content_type: str = "text/html", **headers: str) -> None:
+        content = body.encode("utf-8") if isinstance(body, str) else body
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in headers.items():
+            self.send_header(name.replace("_", "-"), value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def send_json(self, data: Any) -> None:
+        self.send(200, dumps(data), "application/json")
+
+    def body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def handle_request(self, method: str) -> None:
+        body = self.body()
+        delay, status = self.server.fault()
+
+        if delay:
+            sleep(delay)
+
+        if status == 429:
+            return self.send(429, "Too Many Requests", Retry_After="1")
+        if status is not None:
+            return self.send(status, "Service Unavailable")
+
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split("/") if part]
+
+        match method, parts:
+            case "GET", ["api", "problems", "all"]:
+                return self.problems_all()
+            case _, ["graphql"]:
+                return self.graphql(loads(body or b"{}"))
+            case "GET", ["users", "sign_in"]:
+                return self.send(200, f'<form><input name="authenticity_token" value="{AUTH_TOKEN}"></form>')
+            case "POST", ["users", "sign_in"]:
+                return self.send(
+                    200,
+                    f"<html><head><title>Home | Codewars</title></head><body>"
+                    f'<a id="header_profile_link" href="/users/{USERNAME}">Profile</a></body></html>',
+                )
+            case "GET", ["users", _, "completed_solutions"]:
+                return self.completed_solutions(int(query.get("page", 0)))
+            case "GET", ["kata", kata_id]:
+                return self.kata_page(kata_id)
+            case "GET", ["api", "v1", "code-challenges", kata_id] if self.server.codewars_api:
+                return self.code_challenge(kata_id)
+
+        self.send(404, "Not Found")
+
+    def do_GET(self) -> None:
+        self.handle_request("GET")
+
+    def do_POST(self) -> None:
+        self.handle_request("POST")
+
+    def problems_all(self) -> None:
+        self.send_json(
+            {
+                "stat_status_pairs": [
+                    {
+                        "stat": {
+                            "question_id": question.id,
+                            "question__title_slug": question.slug,
+                            "question__title": question.title,
+                        },
+                        "difficulty": {"level": question.level},
+                        "status": "ac",
+                    }
+                    for question in self.server.data.questions
+                ]
+            }
+        )
+
+    def graphql(self, payload: dict[str, Any]) -> None:
+        variables = payload.get("variables", {})
+        operation = payload.get("operationName")
+
+        if operation == "Submissions":
+            question = self.server.questions[variables["questionSlug"]]
+            submissions = sorted(question.submissions, key=lambda s: int(s.id), reverse=True)
+
+            offset = int(variables.get("offset") or 0)
+            if (last_key := variables.get("lastKey")) is not None:
+                offset = next((i + 1 for i, s in enumerate(submissions) if s.id == last_key), len(submissions))
+
+            limit = int(variables.get("limit", -1))
+            page = submissions[offset:] if limit < 0 else submissions[offset : offset + limit]
+            has_next = offset + len(page) < len(submissions)
+
+            return self.send_json(
+                {
+                    "data": {
+                        "submissionList": {
+                            "lastKey": page[-1].id if page else None,
+                            "hasNext": has_next,
+                            "submissions": [
+                                {
+                                    "id": s.id,
+                                    "statusDisplay": "Accepted",
+                                    "lang": s.lang,
+                                    "url": f"/submissions/detail/{s.id}/",
+                                }
+                                for s in page
+                            ],
+                            "__typename": "SubmissionListNode",
+                        }
+                    }
+                }
+            )
+
+        if operation == "questionData":
+            question = self.server.questions[variables["titleSlug"]]
+            return self.send_json({"data": {"question": {"content": question.content, "__typename": "QuestionNode"}}})
+
+        if "submissionDetails" in payload.get("query", ""):
+            submission = self.server.submissions[str(variables["submissionId"])]
+            return self.send_json({"data": {"submissionDetails": {"code": submission.code}}})
+
+        self.send(400, "Unknown operation")
+
+    def completed_solutions(self, page: int) -> None:
+        size = self.server.page_size
+        katas = self.server.data.katas[page * size : (page + 1) * size]
+
+        items = "".join(
+            f'<div class="list-item-solutions">'
+            f'<div class="item-title"><div class="tag"><span>{kata.kyu}</span></div>'
+            f'<a href="/kata/{kata.id}">{escape(kata.name)}</a></div>'
+            + "".join(
+                f'<h6>{lang.title()}:</h6><div class="markdown"><pre><code>{escape(code)}</code></pre></div>'
+                for lang, codes in kata.solutions.items()
+                for code in codes
+            )
+            + "</div>"
+            for kata in katas
+        )
+
+        self.send(200, f"<html><body>{items}</body></html>")
+
+    def code_challenge(self, kata_id: str) -> None:
+        if (kata := self.server.katas.get(kata_id)) is None:
+            return self.send(404, dumps({"success": False, "reason": "not found"}), "application/json")
+
+        self.send_json(
+            {
+                "id": kata.id,
+                "name": kata.name,
+                "slug": kata.id,
+                "url": f"/kata/{kata.id}",
+                "rank": {"name": kata.kyu},
+                "description": kata.description,
+            }
+        )
+
+    def kata_page(self, kata_id: str) -> None:
+        if (kata := self.server.katas.get(kata_id)) is None:
+            return self.send(404, "Not Found")
+
+        data = dumps(dumps({"description": kata.description}))
+        self.send(200, f"<html><body><script>\nApp.setup({{\ndata: JSON.parse({data})\n}});\n</script></body></html>")
+
+
+def serve(
+    data: FakeData,
+    faults: FaultConfig | None = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    page_size: int = 15,
+    codewars_api: bool = True,
+) -> FakePlatformServer:
+    server = FakePlatformServer((host, port), data, faults, page_size, codewars_api)
+    Thread(target=server.serve_forever, daemon=True).start()
+
+    return server
+
+
+@click.command()
+@click.option("--host", type=str, default="127.0.0.1")
+@click.option("--port", type=int, default=8000)
+@click.option("--leetcode-tasks", type=int, default=1_000)
+@click.option("--codewars-tasks", type=int, default=1_000)
+@click.option("--page-size", type=int, default=15)
+@click.option("--latency", type=float, default=0.0)
+@click.option("--jitter", type=float, default=0.0)
+@click.option("--rate-limit", type=float, default=0.0)
+@click.option("--server-error", type=float, default=0.0)
+@click.option("--seed", type=int, default=0)
+@click.option("--codewars-api/--no-codewars-api", default=True)
+def main(
+    host: str,
+    port: int,
+    leetcode_tasks: int,
+    codewars_tasks: int,
+    page_size: int,
+    latency: float,
+    jitter: float,
+    rate_limit: float,
+    server_error: float,
+    seed: int,
+    codewars_api: bool,
+) -> None:
+    faults = FaultConfig(latency, jitter, rate_limit, server_error, seed)
+    server = FakePlatformServer(
+        (host, port),
+        make_data(leetcode_tasks, codewars_tasks, seed),
+        faults,
+        page_size,
+        codewars_api,
+    )
+
+    click.echo(f"Serving fake LeetCode and Codewars on {server.base_url}", err=True)
+    server.serve_forever()
+
+
+__all__ = [
+    "FakeData",
+    "FakePlatformServer",
+    "FaultConfig",
+    "make_data",
+    "serve",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import asyncio
+import os
+import tracemalloc
+from dataclasses import dataclass, asdict
+from functools import partial
+from json import dumps, loads
+from pathlib import Path
+from shutil import copytree
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Callable
+
+from git import Repo
+
+from archgenerator.cache import CACHES
+from archgenerator.cassette import Cassette, ReplayTransport
+from archgenerator.client import TRANSPORT_FACTORY, create_client
+from archgenerator.docs import context
+from archgenerator.docs.commit import commit_docs
+from archgenerator.docs.generator import generate_docs
+from archgenerator.ext.codewars.context import CODEWARS_USERNAME
+from archgenerator.ext.codewars.fetcher import katas_stream
+from archgenerator.models import Book
+from archgenerator.platform import PLATFORMS, load_platforms
+from archgenerator.serializer import dump, load
+
+from .fake_server import USERNAME, make_data, serve
+from .synthetic import make_book, mutate_book
+
+
+@dataclass
+class Measurement:
+    seconds: float
+    peak_memory: int
+
+
+Results = dict[str, dict[str, Measurement]]
+
+
+def measure(func: Callable[..., Any], *args: Any, trace_memory: bool = False) -> Measurement:
+    if trace_memory:
+        tracemalloc.start()
+
+    start = perf_counter()
+
+    try:
+        func(*args)
+    finally:
+        elapsed = perf_counter() - start
+        peak = 0
+
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    return Measurement(seconds=elapsed, peak_memory=peak)
+
+
+def measure_passes(func: Callable[[bool], dict[str, Measurement]]) -> dict[str, Measurement]:
+    timed, traced = func(False), func(True)
+
+    return {
+        stage: Measurement(seconds=measurement.seconds, peak_memory=traced[stage].peak_memory)
+        for stage, measurement in timed.items()
+    }
+
+
+def init_repo(root: Path) -> Repo:
+    root.mkdir(parents=True, exist_ok=True)
+    repo = Repo.init(root)
+
+    (root / "README.md").touch()
+    repo.index.add(["README.md"])
+    repo.index.commit("Initial commit")
+
+    return repo
+
+
+def run_scale(tasks: int, workers: int = 1, trace_memory: bool = False) -> dict[str, Measurement]:
+    measure_stage = partial(measure, trace_memory=trace_memory)
+
+    context.GIT_USERNAME.set("benchmark")
+    context.GIT_EMAIL.set("benchmark@example.com")
+
+    books = [
+        make_book("CodeWars ✨", tasks // 2, seed=0),
+        make_book("LeetCode 💫", tasks - tasks // 2, seed=1),
+    ]
+
+    results = {}
+    with TemporaryDirectory() as tmp:
+        root = Path(tmp)
+
+        book_path = root / "codewars.json"
+        results["serializer.dump"] = measure_stage(dump, books[0], book_path)
+        results["serializer.load"] = measure_stage(load, Book, book_path)
+
+        docs = root / "docs"
+        init_repo(docs)
+
+        results["generate_docs"] = measure_stage(generate_docs, books, docs, workers)
+        results["commit_docs"] = measure_stage(commit_docs, docs)
+
+        for book in books:
+            mutate_book(book)
+
+        results["generate_docs.incremental"] = measure_stage(generate_docs, books, docs, workers)
+
+        written_docs = root / "written-docs"
+        copytree(docs, written_docs)
+
+        results["commit_docs.incremental"] = measure_stage(commit_docs, docs)
+        results["commit_docs.incremental.written"] = measure_stage(
+            partial(commit_docs, written_docs, staging="written"),
+        )
+
+    return results
+
+
+def run_replay(
+    cassette: Path,
+    platforms: list[str],
+    latency: float = 0.0,
+    trace_memory: bool = False,
+) -> dict[str, Measurement]:
+    load_platforms()
+
+    for cache in CACHES.values():
+        cache.clear()
+
+    recorded = Cassette.load(cassette)
+    TRANSPORT_FACTORY.set(lambda: ReplayTransport(recorded, latency))
+
+    results = {}
+    for name in platforms or [*PLATFORMS]:
+        platform = PLATFORMS[name]
+
+        for _, var in platform.options.values():
+            var.set("replay")
+
+        results[f"generate_book.{name}"] = measure(asyncio.run, platform.generate_book(), trace_memory=trace_memory)
+
+    return results
+
+
+def current_rss() -> int:
+    with open("/proc/self/statm", encoding="ascii") as statm:
+        _, resident, *_ = statm.read().split()
+
+    return int(resident) * os.sysconf("SC_PAGE_SIZE")
+
+
+def run_crawl(pages: int, page_size: int = 15, checkpoints: int = 4) -> dict[str, Measurement]:
+    server = serve(make_data(0, pages * page_size), page_size=page_size)
+    CODEWARS_USERNAME.set(USERNAME)
+
+    results = {}
+    step = max(1, pages // checkpoints) * page_size
+
+    async def crawl() -> None:
+        start = perf_counter()
+
+        crawled = 0
+        async with create_client(base_url=server.base_url) as client:
+            async for _ in katas_stream(client):
+                crawled += 1
+
+                if crawled % step == 0:
+                    results[f"crawl.{crawled // page_size}_pages"] = Measurement(perf_counter() - start, current_rss())
+
+    try:
+        asyncio.run(crawl())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    return results
+
+
+def run(scales: list[int], workers: int = 1) -> Results:
+    return {str(tasks): measure_passes(partial(run_scale, tasks, workers)) for tasks in scales}
+
+
+def save(results: Results, path: Path) -> None:
+    path.write_text(
+        dumps(
+            {scale: {stage: asdict(m) for stage, m in stages.items()} for scale, stages in results.items()}, indent=4
+        ),
+        encoding="utf-8",
+    )
+
+
+def load_baseline(path: Path) -> Results:
+    data = loads(path.read_text(encoding="utf-8"))
+    return {scale: {stage: Measurement(**m) for stage, m in stages.items()} for scale, stages in data.items()}
+
+
+def regressions(results: Results, baseline: Results, tolerance: float) -> list[str]:
+    found = []
+    for scale, stages in results.items():
+        for stage, current in stages.items():
+            if (expected := baseline.get(scale, {}).get(stage)) is None:
+                continue
+
+            for metric in ("seconds", "peak_memory"):
+                actual, limit = getattr(current, metric), getattr(expected, metric) * (1 + tolerance)
+
+                if actual > limit:
+                    found.append(f"{scale} tasks, {stage}: {metric} {actual:.3f} > {limit:.3f}")
+
+    return found
+
+
+__all__ = [
+    "Measurement",
+    "Results",
+    "load_baseline",
+    "measure",
+    "measure_passes",
+    "regressions",
+    "run",
+    "run_crawl",
+    "run_replay",
+    "run_scale",
+    "save",
+]
@@ -0,0 +1,65 @@
+from random import Random
+
+from archgenerator.models import Book, Section, Solution, Task
+
+WORDS = (
+    "array string integer return given function number list element value sum order "
+    "matrix tree node graph path minimum maximum length sequence character index count"
+).split()
+
+LANGUAGES = ("python", "javascript", "java", "c++", "rust", "sql")
+
+
+def _text(rnd: Random, words: int) -> str:
+    return " ".join(rnd.choice(WORDS) for _ in range(words))
+
+
+def make_task(rnd: Random, index: int, description_words: int = 300, code_lines: int = 25) -> Task:
+    languages = rnd.sample(LANGUAGES, k=rnd.randint(1, 3))
+
+    description = f"<p>{_text(rnd, description_words)}</p>"
+    if rnd.random() < 0.1:
+        description += "\n```if:python\nPython only note\n```\n<style>.note { color: red; }</style>"
+
+    return Task(
+        name=f"{_text(rnd, 3).title()} {index}",
+        link=f"https://example.com/tasks/{index}",
+        description=description,
+        solutions={
+            language: [
+                Solution(
+                    language=language,
+                    code="\n".join(f"    {_text(rnd, 6)}" for _ in range(code_lines)),
+                )
+            ]
+            for language in languages
+        },
+        metadata={"id": index},
+    )
+
+
+def make_book(name: str, tasks: int, sections: int = 8, seed: int = 0) -> Book:
+    rnd = Random(seed)
+
+    book = Book(name=name, sections=[Section(name=f"{i + 1} kyu", tasks=[]) for i in range(sections)])
+    for i in range(tasks):
+        book.sections[i % sections].tasks.append(make_task(rnd, i))
+
+    return book
+
+
+def mutate_book(book: Book, ratio: float = 0.1, seed: int = 1) -> None:
+    rnd = Random(seed)
+
+    for section in book.sections:
+        for task in section.tasks:
+            if rnd.random() < ratio:
+                for solutions in task.solutions.values():
+                    solutions[0].code += f"\n    # {_text(rnd, 4)}"
+
+
+__all__ = [
+    "make_book",
+    "make_task",
+    "mutate_book",
+]
@@ -1,3 +1,3 @@
-poetry run black archgenerator
-poetry run ruff check --fix archgenerator
-poetry run mypy archgenerator
+poetry run black archgenerator benchmarks
+poetry run ruff check --fix archgenerator benchmarks
+poetry run mypy archgenerator benchmarks